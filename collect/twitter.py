@@ -1,20 +1,41 @@
 import ast
+import itertools
 import logging
+import multiprocessing
 import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import List, Tuple
 
 import pandas as pd
 import twint
 from decouple import config
 from tqdm import tqdm
 
-from helpers.data_static import ALEXA1M
-from helpers.date_time import get_standardized_now, standardize_date_time
-from helpers.extractor import extract_media_info, extract_name, extract_urls
-from helpers.geo import complete_location
-from helpers.hash import create_hash, get_checksum
+from helpers.buffer import NodeBuffer
+from helpers.cache import PersistentSet
+from helpers.data_static import is_popular_domain
+from helpers.date_time import get_standardized_now, standardize_date_times
+from helpers.extractor import extract_media_info, extract_name, extract_urls, extract_urls_many, url_cache_info
+from helpers.geo import complete_location, complete_locations, get_geo_cache
+from helpers.hash import create_hash
+from helpers.media import MediaDownloader, get_media_checksum, get_media_index
 from helpers.misc import clean_dict, download_media
-from helpers.neo4j_db import load_graph_into_db
-from helpers.schema import check_schema, create_unique_id, get_primary_keys, get_properties
+from helpers.neo4j_db import chunks, load_graph_into_db
+from helpers.schema import check_schema, create_unique_id, create_unique_ids_frame, get_primary_keys, get_properties
+
+# labels of nodes extracted from Twitter data
+NODE_LABELS = [
+    "SocialMediaPost",
+    "Username",
+    "Person",
+    "Location",
+    "Text",
+    "Media",
+    "UserAccount",
+    "Domain",
+    "Keyword",
+    "HashValue",
+]
 
 
 def twitter_lookup(usernames: str) -> str:
@@ -121,597 +142,906 @@ def twitter_search(search_text: str, start: str = "", stop: str = "") -> str:
     return data_path
 
 
-def store_twitter_data(data_path: str, data_type: str = "SocialMediaPost"):
-    """
-    Store collected Twitter data in Neo4j database.
-    data_type: type of collected data (SocialMediaPosting or UserAccount)
-    """
+def parse_list_column(column: pd.Series) -> pd.Series:
+    """ Parse column of list literals, e.g. "['a', 'b']"; every distinct value is parsed only once. """
 
-    # check input
-    organisms = ["SocialMediaPost", "UserAccount"]
-    assert data_type in organisms, "data_type should be 'SocialMediaPost' or 'UserAccount'!"
+    column = column.fillna("[]")
 
-    # init
-    nodes = {
-        "SocialMediaPost": [],
-        "Username": [],
-        "Person": [],
-        "Location": [],
-        "Text": [],
-        "Media": [],
-        "UserAccount": [],
-        "Domain": [],
-        "Keyword": [],
-        "HashValue": [],
-    }
-    edges = {"INCLUSION": [], "CO_OCCURRENCE": []}
+    parsed = {v: [n.strip() for n in ast.literal_eval(v)] for v in column.unique()}
 
-    # read data
-    data = pd.read_csv(data_path, sep=",", header=0)
+    return column.map(parsed)
 
-    # drop duplicates
-    data.drop_duplicates(subset=["id"], keep="first", inplace=True)
 
-    # basic information of all nodes/relationships
-    basic_info = {"timestamp": get_standardized_now(), "schemaVersion": 0.1}
+def preprocess_social_media_posts(data: pd.DataFrame, basic_info: dict) -> pd.DataFrame:
+    """
+    Column-wise preprocessing of collected Tweets (Twint CSV) before the per-record transformation:
+    list columns are parsed, domains of URLs are extracted, dates are standardized and
+    unique ids of posts, usernames and texts are added.
+    """
 
-    # extract nodes/links for every entry
-    records = data.to_dict(orient="records")
+    # parse list columns
+    list_columns = ["photos", "hashtags", "cashtags", "urls", "mentions"]
+    data = data.assign(**{c: parse_list_column(column=data[c]) for c in list_columns})
+
+    # domains of listed URLs (first URL found in each, see transform_social_media_post)
+    listed_urls = list(dict.fromkeys(u for urls in data["urls"] for u in urls))
+    extracted_urls = extract_urls_many(texts=listed_urls)
+
+    domains = dict()
+    for i, domain in zip(extracted_urls["index"], extracted_urls["domain"]):
+        domains.setdefault(listed_urls[i], domain)
+
+    data = data.assign(urlDomains=[{u: domains.get(u) for u in urls} for urls in data["urls"]])
+
+    # standardize dates (milliseconds since epoch)
+    data = data.assign(datePublished=standardize_date_times(date_times=data["created_at"] // 1000, timestamp=True))
+
+    # unique ids
+    social_media_posts = pd.DataFrame(
+        {
+            "platform": "twitter",
+            "id": data["id"].astype(str),
+            "url": data["link"],
+            "shared": data["retweet"],
+            "likesCount": data["likes_count"],
+            "repliesCount": data["replies_count"],
+            "sharesCount": data["retweets_count"],
+            "datePublished": data["datePublished"],
+            "type": pd.Series("share", index=data.index).where(data["retweet"].astype(bool)),
+        },
+        index=data.index,
+    ).assign(**basic_info)
+    usernames = pd.DataFrame({"username": data["username"]}, index=data.index).assign(**basic_info)
+    texts = pd.DataFrame({"text": data["tweet"]}, index=data.index).assign(**basic_info)
+
+    return data.assign(
+        socialMediaPostNodeId=create_unique_ids_frame(data=social_media_posts, schema="SocialMediaPost"),
+        usernameNodeId=create_unique_ids_frame(data=usernames, schema="Username"),
+        textNodeId=create_unique_ids_frame(data=texts, schema="Text"),
+    )
+
+
+def preprocess_user_accounts(data: pd.DataFrame, basic_info: dict) -> pd.DataFrame:
+    """
+    Column-wise preprocessing of collected Twitter user accounts (Twint CSV) before the per-record transformation:
+    dates are standardized and unique ids of user accounts, usernames and texts (bio) are added.
+    """
 
-    if data_type == "SocialMediaPost":
+    # standardize dates
+    data = data.assign(
+        dateTimeJoined=standardize_date_times(
+            date_times=(data["join_date"] + " " + data["join_time"]), format="%d %b %Y %I:%M %p"
+        )
+    )
+
+    # unique ids
+    user_accounts = pd.DataFrame(
+        {
+            "private": data["private"].astype(bool),
+            "verifiedByPlatform": data["verified"].astype(bool),
+            "followersCount": data["followers"],
+            "followingCount": data["following"],
+            "dateTimeJoined": data["dateTimeJoined"],
+            "mediaCount": data["media"],
+            "postingsCount": data["tweets"],
+            "platform": "twitter",
+            "id": data["id"].astype(str),
+            "url": ("https:/twitter.com/" + data["username"]),
+            "likesCount": data["likes"],
+        },
+        index=data.index,
+    ).assign(**basic_info)
+    usernames = pd.DataFrame({"username": data["username"]}, index=data.index)
+    texts = pd.DataFrame({"text": data["bio"]}, index=data.index).assign(**basic_info)
+
+    return data.assign(
+        userAccountNodeId=create_unique_ids_frame(data=user_accounts, schema="UserAccount"),
+        usernameNodeId=create_unique_ids_frame(data=usernames, schema="Username"),
+        textNodeId=create_unique_ids_frame(data=texts, schema="Text"),
+    )
+
+
+def transform_social_media_post(
+    x: dict, nodes: NodeBuffer, edges: dict, basic_info: dict, media_paths: dict = None, locations: dict = None
+):
+    """
+    Extract nodes/links of a collected Tweet (record of Twint CSV preprocessed by preprocess_social_media_posts).
+    Nodes and edges are added to the given buffers.
+    media_paths: paths of already downloaded media by URL; other media is downloaded on the fly
+    locations: already geocoded locations by coordinates; other locations are geocoded on the fly
+    """
 
-        for x in tqdm(records, desc="SocialMediaPosts", total=len(records), unit="records"):
+    ###############################################################################################
+    # SocialMediaPost
+
+    # information given in data
+    social_media_post = {
+        "platform": "twitter",
+        "id": str(x["id"]),
+        "url": x["link"],
+        "shared": x["retweet"],
+        "likesCount": x["likes_count"],
+        "repliesCount": x["replies_count"],
+        "sharesCount": x["retweets_count"],
+        "datePublished": x["datePublished"],
+    }
 
-            ###############################################################################################
-            # SocialMediaPost
+    """
+    Unfortunately, given the information Twint extracts, it can not be determined whether the posting
+    is a reply or the original one.
+    """
 
-            # information given in data
-            social_media_post = {
-                "platform": "twitter",
-                "id": str(x["id"]),
-                "url": x["link"],
-                "shared": x["retweet"],
-                "likesCount": x["likes_count"],
-                "repliesCount": x["replies_count"],
-                "sharesCount": x["retweets_count"],
-                "datePublished": standardize_date_time(date_time=(int(x["created_at"] / 1000)), timestamp=True),
+    if x["retweet"]:
+        social_media_post["type"] = "share"
+
+    # add basic information
+    social_media_post.update(basic_info)
+
+    # add unique id
+    social_media_post_unique_id = x["socialMediaPostNodeId"]
+    social_media_post["nodeId"] = social_media_post_unique_id
+
+    # remove possible None and empty values
+    social_media_post = clean_dict(d=social_media_post)
+
+    # check schema
+    if check_schema(data=social_media_post, schema="SocialMediaPost"):
+        # add node to graph
+        nodes.append("SocialMediaPost", social_media_post)
+    else:
+        return
+
+    ###############################################################################################
+    # Username
+
+    # information given in data
+    username = {"username": x["username"]}
+
+    # add basic information
+    username.update(basic_info)
+
+    # add unique id
+    username_unique_id = x["usernameNodeId"]
+    username["nodeId"] = username_unique_id
+
+    # remove possible None and empty values
+    username = clean_dict(d=username)
+
+    # check schema
+    if check_schema(data=username, schema="Username"):
+        # add node to graph
+        nodes.append("Username", username)
+        # add INCLUSION relationship
+        edges["INCLUSION"].append(
+            {
+                "a": social_media_post_unique_id,
+                "b": username_unique_id,
+                "labelA": "SocialMediaPost",
+                "labelB": "Username",
             }
-
-            """
-            Unfortunately, given the information Twint extracts, it can not be determined whether the posting
-            is a reply or the original one.
-            """
-
-            if x["retweet"]:
-                social_media_post["type"] = "share"
-
+        )
+
+    ###############################################################################################
+    # Person
+
+    # information given
+    person = extract_name(s=x["name"])
+
+    # add basic information
+    person.update(basic_info)
+
+    # add unique id
+    person_unique_id = create_unique_id(data=person, schema="Person")
+    person["nodeId"] = person_unique_id
+
+    # remove possible None and empty values
+    person = clean_dict(d=person)
+
+    # check schema
+    if check_schema(data=person, schema="Person"):
+        # add node to graph
+        nodes.append("Person", person)
+        # add INCLUSION relationship
+        edges["INCLUSION"].append(
+            {"a": social_media_post_unique_id, "b": person_unique_id, "labelA": "SocialMediaPost", "labelB": "Person"}
+        )
+        # add CO_OCCURRENCE relationship
+        edges["CO_OCCURRENCE"].append(
+            {"a": username_unique_id, "b": person_unique_id, "labelA": "Username", "labelB": "Person"}
+        )
+
+    ###############################################################################################
+    # Location
+
+    # geo should not be NaN
+    geo = x["geo"]
+    if geo == geo:
+        # geocoded before transformation (copied, as records share locations)
+        if locations is not None and geo in locations:
+            location = dict(locations[geo]) if locations[geo] else None
+        else:
+            location = complete_location(data=geo, given="coordinates")
+
+        # only continue if location could be retrieved
+        if location:
             # add basic information
-            social_media_post.update(basic_info)
+            location.update(basic_info)
 
             # add unique id
-            social_media_post_unique_id = create_unique_id(data=social_media_post, schema="SocialMediaPost")
-            social_media_post["nodeId"] = social_media_post_unique_id
+            location_unique_id = create_unique_id(data=location, schema="Location")
+            location["nodeId"] = location_unique_id
 
             # remove possible None and empty values
-            social_media_post = clean_dict(d=social_media_post)
+            location = clean_dict(d=location)
 
             # check schema
-            if check_schema(data=social_media_post, schema="SocialMediaPost"):
+            if check_schema(data=location, schema="Location"):
                 # add node to graph
-                nodes["SocialMediaPost"].append(social_media_post)
-            else:
-                continue
+                nodes.append("Location", location)
+                # add INCLUSION relationship
+                edges["INCLUSION"].append(
+                    {
+                        "a": social_media_post_unique_id,
+                        "b": location_unique_id,
+                        "labelA": "SocialMediaPost",
+                        "labelB": "Location",
+                    }
+                )
+                # add CO_OCCURRENCE relationships
+                edges["CO_OCCURRENCE"].append(
+                    {"a": username_unique_id, "b": location_unique_id, "labelA": "Username", "labelB": "Location"}
+                )
+                edges["CO_OCCURRENCE"].append(
+                    {"a": person_unique_id, "b": location_unique_id, "labelA": "Person", "labelB": "Location"}
+                )
+
+    ###############################################################################################
+    # Media (Photos)
+
+    media_urls = list(dict.fromkeys(x["photos"]))
+
+    for url in media_urls:
+        # download
+        file_path = media_paths[url] if media_paths and url in media_paths else download_media(url=url)
+        if file_path is None:
+            continue
+
+        # information given in data
+        media = {"url": url, "type": "image", **extract_media_info(s=url)}
+
+        # add basic information
+        media.update(basic_info)
+
+        # add unique id
+        media_unique_id = create_unique_id(data=media, schema="Media")
+        media["nodeId"] = media_unique_id
+
+        # remove possible None and empty values
+        media = clean_dict(d=media)
+
+        # check schema
+        if check_schema(data=media, schema="Media"):
+            # add node to graph
+            nodes.append("Media", media)
 
-            ###############################################################################################
-            # Username
+            # add INCLUSION relationship
+            edges["INCLUSION"].append(
+                {"a": social_media_post_unique_id, "b": media_unique_id, "labelA": "SocialMediaPost", "labelB": "Media"}
+            )
 
-            # information given in data
-            username = {"username": x["username"]}
+            # add hash value
+            hash_value = {"hashValue": get_media_checksum(file_path=file_path)}
 
             # add basic information
-            username.update(basic_info)
+            hash_value.update(basic_info)
 
             # add unique id
-            username_unique_id = create_unique_id(data=username, schema="Username")
-            username["nodeId"] = username_unique_id
+            hash_value_unique_id = create_unique_id(data=hash_value, schema="HashValue")
+            hash_value["nodeId"] = hash_value_unique_id
 
             # remove possible None and empty values
-            username = clean_dict(d=username)
+            hash_value = clean_dict(d=hash_value)
 
             # check schema
-            if check_schema(data=username, schema="Username"):
+            if check_schema(data=hash_value, schema="HashValue"):
                 # add node to graph
-                nodes["Username"].append(username)
+                nodes.append("HashValue", hash_value)
                 # add INCLUSION relationship
-                edges["INCLUSION"].append({"a": social_media_post_unique_id, "b": username_unique_id})
+                edges["INCLUSION"].append(
+                    {"a": media_unique_id, "b": hash_value_unique_id, "labelA": "Media", "labelB": "HashValue"}
+                )
 
-            ###############################################################################################
-            # Person
+    ###############################################################################################
+    # Text
 
-            # information given
-            person = extract_name(s=x["name"])
+    # information given in data
+    keywords = x["hashtags"] + x["cashtags"]
+    urls_in_text = x["urls"]
+    text = {"text": x["tweet"]}
 
-            # add basic information
-            person.update(basic_info)
+    # add basic information
+    text.update(basic_info)
 
-            # add unique id
-            person_unique_id = create_unique_id(data=person, schema="Person")
-            person["nodeId"] = person_unique_id
+    # add unique id
+    text_unique_id = x["textNodeId"]
+    text["nodeId"] = text_unique_id
 
-            # remove possible None and empty values
-            person = clean_dict(d=person)
+    # remove possible None and empty values
+    text = clean_dict(d=text)
 
-            # check schema
-            if check_schema(data=person, schema="Person"):
-                # add node to graph
-                nodes["Person"].append(person)
-                # add INCLUSION relationship
-                edges["INCLUSION"].append({"a": social_media_post_unique_id, "b": person_unique_id})
-                # add CO_OCCURRENCE relationship
-                edges["CO_OCCURRENCE"].append({"a": username_unique_id, "b": person_unique_id})
+    # check schema
+    if check_schema(data=text, schema="Text"):
+        # add node to graph
+        nodes.append("Text", text)
+        # add INCLUSION relationship
+        edges["INCLUSION"].append(
+            {"a": social_media_post_unique_id, "b": text_unique_id, "labelA": "SocialMediaPost", "labelB": "Text"}
+        )
 
-            ###############################################################################################
-            # Location
+    ###############################################################################################
+    # Keywords
 
-            # geo should not be NaN
-            geo = x["geo"]
-            if geo == geo:
-                location = complete_location(data=geo, given="coordinates")
-                # add basic information
-                location.update(basic_info)
+    keywords = list(dict.fromkeys(x["hashtags"]))
 
-                # add unique id
-                location_unique_id = create_unique_id(data=location, schema="Location")
-                location["nodeId"] = location_unique_id
+    # store node IDs of all username mentions
+    node_ids = []
 
-                # remove possible None and empty values
-                location = clean_dict(d=location)
-
-                # check schema
-                if check_schema(data=location, schema="Location"):
-                    # add node to graph
-                    nodes["Location"].append(location)
-                    # add INCLUSION relationship
-                    edges["INCLUSION"].append({"a": social_media_post_unique_id, "b": location_unique_id})
-                    # add CO_OCCURRENCE relationships
-                    edges["CO_OCCURRENCE"].append({"a": username_unique_id, "b": location_unique_id})
-                    edges["CO_OCCURRENCE"].append({"a": person_unique_id, "b": location_unique_id})
+    for h_i, h in enumerate(keywords):
+        # information given in data
+        keyword = {"keyword": h}
 
-            ###############################################################################################
-            # Media (Photos)
+        # add basic information
+        keyword.update(basic_info)
 
-            media_urls = list(set([n.strip() for n in ast.literal_eval(x["photos"])]))
+        # add unique id
+        keyword_unique_id = create_unique_id(data=keyword, schema="Keyword")
+        keyword["nodeId"] = keyword_unique_id
 
-            for url in media_urls:
-                # download
-                file_path = download_media(url=url)
-                if file_path is None:
-                    continue
+        node_ids.append(keyword_unique_id)
 
-                # information given in data
-                media = {"url": url, "type": "image", **extract_media_info(s=url)}
+        # remove possible None and empty values
+        keyword = clean_dict(d=keyword)
 
-                # add basic information
-                media.update(basic_info)
+        # check schema
+        if check_schema(data=keyword, schema="Keyword"):
+            # add node to graph
+            nodes.append("Keyword", keyword)
+            # add INCLUSION relationship
+            edges["INCLUSION"].append(
+                {"a": text_unique_id, "b": keyword_unique_id, "labelA": "Text", "labelB": "Keyword"}
+            )
+            # add CO_OCCURRENCE relationship
+            for i in node_ids[:h_i]:
+                edges["CO_OCCURRENCE"].append(
+                    {"a": i, "b": keyword_unique_id, "labelA": "Keyword", "labelB": "Keyword"}
+                )
 
-                # add unique id
-                media_unique_id = create_unique_id(data=media, schema="Media")
-                media["nodeId"] = media_unique_id
+    ###############################################################################################
+    # Domains
 
-                # remove possible None and empty values
-                media = clean_dict(d=media)
+    # store node IDs of all username mentions
+    node_ids = []
 
-                # check schema
-                if check_schema(data=media, schema="Media"):
-                    # add node to graph
-                    nodes["Media"].append(media)
+    for u_i, u in enumerate(list(dict.fromkeys(urls_in_text))):
+        # URL information (extracted during preprocessing)
+        domain = x["urlDomains"].get(u)
 
-                    # add INCLUSION relationship
-                    edges["INCLUSION"].append({"a": social_media_post_unique_id, "b": media_unique_id})
+        if not domain:
+            continue
 
-                    # add hash value
-                    hash_value = {"hashValue": get_checksum(file=file_path)}
+        # do not consider large webpages
+        if is_popular_domain(domain=domain):
+            continue
 
-                    # add basic information
-                    hash_value.update(basic_info)
+        # information given in data
+        domain = {"domain": domain}
 
-                    # add unique id
-                    hash_value_unique_id = create_unique_id(data=hash_value, schema="HashValue")
-                    hash_value["nodeId"] = hash_value_unique_id
+        # add basic information
+        domain.update(basic_info)
 
-                    # remove possible None and empty values
-                    hash_value = clean_dict(d=hash_value)
+        # add unique id
+        domain_unique_id = create_unique_id(data=domain, schema="Domain")
+        domain["nodeId"] = domain_unique_id
 
-                    # check schema
-                    if check_schema(data=hash_value, schema="HashValue"):
-                        # add node to graph
-                        nodes["HashValue"].append(hash_value)
-                        # add INCLUSION relationship
-                        edges["INCLUSION"].append({"a": media_unique_id, "b": hash_value_unique_id})
+        node_ids.append(domain_unique_id)
 
-            ###############################################################################################
-            # Text
+        # remove possible None and empty values
+        domain = clean_dict(d=domain)
 
-            # information given in data
-            keywords = [n.strip() for n in ast.literal_eval(x["hashtags"])] + [
-                n.strip() for n in ast.literal_eval(x["cashtags"])
-            ]
-            urls_in_text = [n.strip() for n in ast.literal_eval(x["urls"])]
-            text = {"text": x["tweet"]}
-
-            # add basic information
-            text.update(basic_info)
+        # check schema
+        if check_schema(data=domain, schema="Domain"):
+            # add node to graph
+            nodes.append("Domain", domain)
+            # add INCLUSION relationship
+            edges["INCLUSION"].append(
+                {"a": text_unique_id, "b": domain_unique_id, "labelA": "Text", "labelB": "Domain"}
+            )
+            # add CO_OCCURRENCE relationship
+            for i in node_ids[:u_i]:
+                edges["CO_OCCURRENCE"].append({"a": i, "b": domain_unique_id, "labelA": "Domain", "labelB": "Domain"})
 
-            # add unique id
-            text_unique_id = create_unique_id(data=text, schema="Text")
-            text["nodeId"] = text_unique_id
+    ###############################################################################################
+    # Usernames (Mentions)
 
-            # remove possible None and empty values
-            text = clean_dict(d=text)
+    mentions = list(dict.fromkeys(x["mentions"]))
 
-            # check schema
-            if check_schema(data=text, schema="Text"):
-                # add node to graph
-                nodes["Text"].append(text)
-                # add INCLUSION relationship
-                edges["INCLUSION"].append({"a": social_media_post_unique_id, "b": text_unique_id})
+    # store node IDs of all username mentions
+    node_ids = []
 
-            ###############################################################################################
-            # Keywords
+    for m_i, m in enumerate(mentions):
+        # information given in data
+        username = {"username": m}
 
-            keywords = list(set([n.strip() for n in ast.literal_eval(x["hashtags"])]))
+        # add basic information
+        username.update(basic_info)
 
-            # store node IDs of all username mentions
-            node_ids = []
+        # add unique id
+        username_unique_id = create_unique_id(data=username, schema="Username")
+        username["nodeId"] = username_unique_id
 
-            for h_i, h in enumerate(keywords):
-                # information given in data
-                keyword = {"keyword": h}
+        node_ids.append(username_unique_id)
 
-                # add basic information
-                keyword.update(basic_info)
+        # remove possible None and empty values
+        username = clean_dict(d=username)
 
-                # add unique id
-                keyword_unique_id = create_unique_id(data=keyword, schema="Keyword")
-                keyword["nodeId"] = keyword_unique_id
+        # check schema
+        if check_schema(data=username, schema="Username"):
+            # add node to graph
+            nodes.append("Username", username)
+            # add INCLUSION relationship
+            edges["INCLUSION"].append(
+                {"a": text_unique_id, "b": username_unique_id, "labelA": "Text", "labelB": "Username"}
+            )
+            # add CO_OCCURRENCE relationship
+            for i in node_ids[:m_i]:
+                edges["CO_OCCURRENCE"].append(
+                    {"a": i, "b": username_unique_id, "labelA": "Username", "labelB": "Username"}
+                )
+
+
+def transform_user_account(
+    x: dict, nodes: NodeBuffer, edges: dict, basic_info: dict, media_paths: dict = None, locations: dict = None
+):
+    """
+    Extract nodes/links of a collected Twitter user account (record of Twint CSV preprocessed by
+    preprocess_user_accounts).
+    Nodes and edges are added to the given buffers.
+    media_paths: paths of already downloaded media by URL; other media is downloaded on the fly
+    locations: already geocoded locations by address; other locations are geocoded on the fly
+    """
 
-                node_ids.append(keyword_unique_id)
+    ###############################################################################################
+    # UserAccount
+
+    # information given in data
+    user_account = {
+        "private": bool(x["private"]),
+        "verifiedByPlatform": bool(x["verified"]),
+        "followersCount": x["followers"],
+        "followingCount": x["following"],
+        "dateTimeJoined": x["dateTimeJoined"],
+        "mediaCount": x["media"],
+        "postingsCount": x["tweets"],
+        "platform": "twitter",
+        "id": str(x["id"]),
+        "url": ("https:/twitter.com/" + x["username"]),
+        "likesCount": x["likes"],
+    }
 
-                # remove possible None and empty values
-                keyword = clean_dict(d=keyword)
+    # add basic information
+    user_account.update(basic_info)
 
-                # check schema
-                if check_schema(data=keyword, schema="Keyword"):
-                    # add node to graph
-                    nodes["Keyword"].append(keyword)
-                    # add INCLUSION relationship
-                    edges["INCLUSION"].append({"a": text_unique_id, "b": keyword_unique_id})
-                    # add CO_OCCURRENCE relationship
-                    for i in node_ids[:h_i]:
-                        edges["CO_OCCURRENCE"].append({"a": i, "b": keyword_unique_id})
+    # add unique id
+    user_account_unique_id = x["userAccountNodeId"]
+    user_account["nodeId"] = user_account_unique_id
 
-            ###############################################################################################
-            # Domains
+    # remove possible None and empty values
+    user_account = clean_dict(d=user_account)
 
-            # store node IDs of all username mentions
-            node_ids = []
+    # check schema
+    if check_schema(data=user_account, schema="UserAccount"):
+        # add node to graph
+        nodes.append("UserAccount", user_account)
+    else:
+        return
 
-            for u_i, u in enumerate(list(set(urls_in_text))):
-                # extract URL information
-                extracted_url_info = extract_urls(u)
+    ###############################################################################################
+    # Username
 
-                try:
-                    extracted_url_info = extracted_url_info[next(iter(extracted_url_info))]
-                except StopIteration:
-                    continue
+    """
+    The username has already been added to the graph during storage of collected Tweets.
+    The unique ID of the node is calculated for later use.
+    An INCLUSION edge is added between the usename and the user account.
+    """
 
-                if not extracted_url_info:
-                    continue
+    # unique id
+    username_unique_id = x["usernameNodeId"]
 
-                # do not consider large webpages
-                domain = extracted_url_info["domain"]
+    # add INCLUSION relationship
+    edges["INCLUSION"].append(
+        {"a": user_account_unique_id, "b": username_unique_id, "labelA": "UserAccount", "labelB": "Username"}
+    )
 
-                if domain in ALEXA1M:
-                    continue
+    ###############################################################################################
+    # Person
 
-                # information given in data
-                domain = {"domain": domain}
+    """
+    The person has already been added to the graph during storage of collected Tweets.
+    The unique ID of the node is calculated for later use.
+    An INCLUSION edge is added between the person and the user account.
+    """
 
-                # add basic information
-                domain.update(basic_info)
+    # unique id
+    person_unique_id = create_unique_id(data=extract_name(s=x["name"]), schema="Person")
 
-                # add unique id
-                domain_unique_id = create_unique_id(data=domain, schema="Domain")
-                domain["nodeId"] = domain_unique_id
+    # add INCLUSION relationship
+    edges["INCLUSION"].append(
+        {"a": user_account_unique_id, "b": person_unique_id, "labelA": "UserAccount", "labelB": "Person"}
+    )
 
-                node_ids.append(domain_unique_id)
+    ###############################################################################################
+    # Text
 
-                # remove possible None and empty values
-                domain = clean_dict(d=domain)
+    text = x["bio"]
 
-                # check schema
-                if check_schema(data=domain, schema="Domain"):
-                    # add node to graph
-                    nodes["Domain"].append(domain)
-                    # add INCLUSION relationship
-                    edges["INCLUSION"].append({"a": text_unique_id, "b": domain_unique_id})
-                    # add CO_OCCURRENCE relationship
-                    for i in node_ids[:u_i]:
-                        edges["CO_OCCURRENCE"].append({"a": i, "b": domain_unique_id})
+    # text should not be NaN
+    if text == text:
+        # information given in data
+        text = {"text": text}
 
-            ###############################################################################################
-            # Usernames (Mentions)
+        # add basic information
+        text.update(basic_info)
 
-            mentions = list(set([n.strip() for n in ast.literal_eval(x["mentions"])]))
+        # add unique id
+        text_unique_id = x["textNodeId"]
+        text["nodeId"] = text_unique_id
 
-            # store node IDs of all username mentions
-            node_ids = []
+        # remove possible None and empty values
+        text = clean_dict(d=text)
 
-            for m_i, m in enumerate(mentions):
-                # information given in data
-                username = {"username": m}
+        # check schema
+        if check_schema(data=text, schema="Text"):
+            # add node to graph
+            nodes.append("Text", text)
+            # add INCLUSION relationship
+            edges["INCLUSION"].append(
+                {"a": user_account_unique_id, "b": text_unique_id, "labelA": "UserAccount", "labelB": "Text"}
+            )
 
-                # add basic information
-                username.update(basic_info)
+    ###############################################################################################
+    # Domains
 
-                # add unique id
-                username_unique_id = create_unique_id(data=username, schema="Username")
-                username["nodeId"] = username_unique_id
+    text = x["bio"]
 
-                node_ids.append(username_unique_id)
+    if text == text:
+        # extract urls form bio
+        extracted_urls = extract_urls(text)
 
-                # remove possible None and empty values
-                username = clean_dict(d=username)
+        # store node IDs of all username mentions
+        node_ids = []
 
-                # check schema
-                if check_schema(data=username, schema="Username"):
-                    # add node to graph
-                    nodes["Username"].append(username)
-                    # add INCLUSION relationship
-                    edges["INCLUSION"].append({"a": text_unique_id, "b": username_unique_id})
-                    # add CO_OCCURRENCE relationship
-                    for i in node_ids[:m_i]:
-                        edges["CO_OCCURRENCE"].append({"a": i, "b": username_unique_id})
+        for u_i, u in enumerate(list(extracted_urls.keys())):
+            # URL information
+            url_info = extracted_urls[u]
 
-    if data_type == "UserAccount":
+            if not url_info:
+                continue
 
-        for x in tqdm(records, desc="UserAccounts", total=len(records), unit="records"):
+            # do not consider large webpages
+            domain = url_info["domain"]
 
-            ###############################################################################################
-            # UserAccount
+            if is_popular_domain(domain=domain):
+                continue
 
             # information given in data
-            user_account = {
-                "private": bool(x["private"]),
-                "verifiedByPlatform": bool(x["verified"]),
-                "followersCount": x["followers"],
-                "followingCount": x["following"],
-                "dateTimeJoined": standardize_date_time(
-                    date_time=(x["join_date"] + " " + x["join_time"]), format="%d %b %Y %I:%M %p"
-                ),
-                "mediaCount": x["media"],
-                "postingsCount": x["tweets"],
-                "platform": "twitter",
-                "id": str(x["id"]),
-                "url": ("https:/twitter.com/" + x["username"]),
-                "likesCount": x["likes"],
-            }
+            domain = {"domain": domain}
 
             # add basic information
-            user_account.update(basic_info)
+            domain.update(basic_info)
 
             # add unique id
-            user_account_unique_id = create_unique_id(data=user_account, schema="UserAccount")
-            user_account["nodeId"] = user_account_unique_id
+            domain_unique_id = create_unique_id(data=domain, schema="Domain")
+            domain["nodeId"] = domain_unique_id
+
+            node_ids.append(domain_unique_id)
 
             # remove possible None and empty values
-            user_account = clean_dict(d=user_account)
+            domain = clean_dict(d=domain)
 
             # check schema
-            if check_schema(data=user_account, schema="UserAccount"):
+            if check_schema(data=domain, schema="Domain"):
                 # add node to graph
-                nodes["UserAccount"].append(user_account)
-            else:
-                continue
+                nodes.append("Domain", domain)
+                # add INCLUSION relationship
+                edges["INCLUSION"].append(
+                    {"a": text_unique_id, "b": domain_unique_id, "labelA": "Text", "labelB": "Domain"}
+                )
+                # add CO_OCCURRENCE relationship
+                for i in node_ids[:u_i]:
+                    edges["CO_OCCURRENCE"].append(
+                        {"a": i, "b": domain_unique_id, "labelA": "Domain", "labelB": "Domain"}
+                    )
+
+    ###############################################################################################
+    # Location
+
+    # location should be given
+    location = x["location"]
+
+    # location should not be NaN
+    if location == location:
+        # geocoded before transformation (copied, as records share locations)
+        if locations is not None and location in locations:
+            location = dict(locations[location]) if locations[location] else None
+        else:
+            location = complete_location(data=location, given="address")
+
+        # only continue if location could be retrieved
+        if location:
+            # add basic information
+            location.update(basic_info)
 
-            ###############################################################################################
-            # Username
+            # add unique id
+            location_unique_id = create_unique_id(data=location, schema="Location")
+            location["nodeId"] = location_unique_id
 
-            """
-            The username has already been added to the graph during storage of collected Tweets.
-            The unique ID of the node is calculated for later use.
-            An INCLUSION edge is added between the usename and the user account.
-            """
+            # remove possible None and empty values
+            location = clean_dict(d=location)
 
-            # unique id
-            username_unique_id = create_unique_id(data={"username": x["username"]}, schema="Username")
+            # check schema
+            if check_schema(data=location, schema="Location"):
+                # add node to graph
+                nodes.append("Location", location)
+                # add INCLUSION relationship
+                edges["INCLUSION"].append(
+                    {
+                        "a": user_account_unique_id,
+                        "b": location_unique_id,
+                        "labelA": "UserAccount",
+                        "labelB": "Location",
+                    }
+                )
+                # add CO_OCCURRENCE relationships
+                edges["CO_OCCURRENCE"].append(
+                    {"a": username_unique_id, "b": location_unique_id, "labelA": "Username", "labelB": "Location"}
+                )
+                edges["CO_OCCURRENCE"].append(
+                    {"a": person_unique_id, "b": location_unique_id, "labelA": "Person", "labelB": "Location"}
+                )
+
+    ###############################################################################################
+    # Media (profile image and profile background image)
+
+    media_urls = list(dict.fromkeys([x["profile_image_url"], x["background_image"]]))
+
+    for i, url in enumerate(media_urls):
+        # URL should not be NaN
+        if url == url:
+            # download
+            file_path = media_paths[url] if media_paths and url in media_paths else download_media(url=url)
+            if file_path is None:
+                continue
 
-            # add INCLUSION relationship
-            edges["INCLUSION"].append({"a": user_account_unique_id, "b": username_unique_id})
+            # information given in data
+            media = {"url": url, "type": "image", **extract_media_info(s=url)}
 
-            ###############################################################################################
-            # Person
+            # add type of image properties
+            if i == 0:
+                media["profileImage"] = True
+            if i == 1:
+                media["profileBackgroundImage"] = True
 
-            """
-            The person has already been added to the graph during storage of collected Tweets.
-            The unique ID of the node is calculated for later use.
-            An INCLUSION edge is added between the person and the user account.
-            """
+            # add basic information
+            media.update(basic_info)
 
-            # unique id
-            person_unique_id = create_unique_id(data=extract_name(s=x["name"]), schema="Person")
+            # add unique id
+            media_unique_id = create_unique_id(data=media, schema="Media")
+            media["nodeId"] = media_unique_id
 
-            # add INCLUSION relationship
-            edges["INCLUSION"].append({"a": user_account_unique_id, "b": person_unique_id})
+            # remove possible None and empty values
+            media = clean_dict(d=media)
 
-            ###############################################################################################
-            # Text
+            # check schema
+            if check_schema(data=media, schema="Media"):
+                # add node to graph
+                nodes.append("Media", media)
 
-            text = x["bio"]
+                # add INCLUSION relationship
+                edges["INCLUSION"].append(
+                    {"a": user_account_unique_id, "b": media_unique_id, "labelA": "UserAccount", "labelB": "Media"}
+                )
 
-            # text should not be NaN
-            if text == text:
-                # information given in data
-                text = {"text": text}
+                # add hash value
+                hash_value = {"hashValue": get_media_checksum(file_path=file_path)}
 
                 # add basic information
-                text.update(basic_info)
+                hash_value.update(basic_info)
 
                 # add unique id
-                text_unique_id = create_unique_id(data=text, schema="Text")
-                text["nodeId"] = text_unique_id
+                hash_value_unique_id = create_unique_id(data=hash_value, schema="HashValue")
+                hash_value["nodeId"] = hash_value_unique_id
 
                 # remove possible None and empty values
-                text = clean_dict(d=text)
+                hash_value = clean_dict(d=hash_value)
 
                 # check schema
-                if check_schema(data=text, schema="Text"):
+                if check_schema(data=hash_value, schema="HashValue"):
                     # add node to graph
-                    nodes["Text"].append(text)
+                    nodes.append("HashValue", hash_value)
                     # add INCLUSION relationship
-                    edges["INCLUSION"].append({"a": user_account_unique_id, "b": text_unique_id})
-
-            ###############################################################################################
-            # Domains
-
-            text = x["bio"]
-
-            if text == text:
-                # extract urls form bio
-                extracted_urls = extract_urls(text)
-
-                # store node IDs of all username mentions
-                node_ids = []
-
-                for u_i, u in enumerate(list(set(extracted_urls.keys()))):
-                    # URL information
-                    url_info = extracted_urls[u]
-
-                    if not url_info:
-                        continue
-
-                    # do not consider large webpages
-                    domain = url_info["domain"]
-
-                    if domain in ALEXA1M:
-                        continue
-
-                    # information given in data
-                    domain = {"domain": domain}
+                    edges["INCLUSION"].append(
+                        {"a": media_unique_id, "b": hash_value_unique_id, "labelA": "Media", "labelB": "HashValue"}
+                    )
 
-                    # add basic information
-                    domain.update(basic_info)
 
-                    # add unique id
-                    domain_unique_id = create_unique_id(data=domain, schema="Domain")
-                    domain["nodeId"] = domain_unique_id
+def transform_records(
+    records: List[dict], data_type: str, basic_info: dict, media_paths: dict = None, locations: dict = None
+) -> Tuple[NodeBuffer, dict]:
+    """
+    Extract nodes/links of preprocessed records into new buffers of nodes and edges.
+    Defined on module level, hence it can be run in worker processes. Workers should be given all
+    media paths and locations, so they neither download nor geocode (caches and rate limits are per process).
+    """
 
-                    node_ids.append(domain_unique_id)
+    nodes = NodeBuffer(labels=NODE_LABELS)
+    edges = {"INCLUSION": [], "CO_OCCURRENCE": []}
 
-                    # remove possible None and empty values
-                    domain = clean_dict(d=domain)
+    transform = transform_social_media_post if data_type == "SocialMediaPost" else transform_user_account
 
-                    # check schema
-                    if check_schema(data=domain, schema="Domain"):
-                        # add node to graph
-                        nodes["Domain"].append(domain)
-                        # add INCLUSION relationship
-                        edges["INCLUSION"].append({"a": text_unique_id, "b": domain_unique_id})
-                        # add CO_OCCURRENCE relationship
-                        for i in node_ids[:u_i]:
-                            edges["CO_OCCURRENCE"].append({"a": i, "b": domain_unique_id})
+    for x in records:
+        transform(x=x, nodes=nodes, edges=edges, basic_info=basic_info, media_paths=media_paths, locations=locations)
 
-            ###############################################################################################
-            # Location
+    return nodes, edges
 
-            # location should be given
-            location = x["location"]
 
-            # location should not be NaN
-            if location == location:
-                location = complete_location(data=location, given="address")
+def transform_many(
+    records: List[dict],
+    data_type: str,
+    basic_info: dict,
+    media_paths: dict = None,
+    locations: dict = None,
+    executor: Executor = None,
+    chunk_size: int = None,
+) -> Tuple[NodeBuffer, dict]:
+    """
+    Extract nodes/links of preprocessed records chunk by chunk, in parallel if an executor is given.
+    Buffers of the chunks are merged in order of the records, hence the result is identical to the serial one.
+    media_paths: paths of already downloaded media by URL
+    locations: already geocoded locations by coordinates/address
+    chunk_size: number of records transformed by a worker at once (default: TWITTER_WORKER_CHUNK_SIZE)
+    """
 
-                # only continue if location could be retrieved
-                if location:
-                    # add basic information
-                    location.update(basic_info)
+    if chunk_size is None:
+        chunk_size = config("TWITTER_WORKER_CHUNK_SIZE", default=500, cast=int)
 
-                    # add unique id
-                    location_unique_id = create_unique_id(data=location, schema="Location")
-                    location["nodeId"] = location_unique_id
+    parts = list(chunks(data=records, size=chunk_size))
+    data_types = [data_type] * len(parts)
+    basic_infos = [basic_info] * len(parts)
+    media_paths = [media_paths] * len(parts)
+    locations = [locations] * len(parts)
 
-                    # remove possible None and empty values
-                    location = clean_dict(d=location)
+    if executor is None:
+        results = map(transform_records, parts, data_types, basic_infos, media_paths, locations)
+    else:
+        results = executor.map(transform_records, parts, data_types, basic_infos, media_paths, locations)
 
-                    # check schema
-                    if check_schema(data=location, schema="Location"):
-                        # add node to graph
-                        nodes["Location"].append(location)
-                        # add INCLUSION relationship
-                        edges["INCLUSION"].append({"a": user_account_unique_id, "b": location_unique_id})
-                        # add CO_OCCURRENCE relationships
-                        edges["CO_OCCURRENCE"].append({"a": username_unique_id, "b": location_unique_id})
-                        edges["CO_OCCURRENCE"].append({"a": person_unique_id, "b": location_unique_id})
+    # merge in order
+    nodes = NodeBuffer(labels=NODE_LABELS)
+    edges = {"INCLUSION": [], "CO_OCCURRENCE": []}
 
-            ###############################################################################################
-            # Media (profile image and profile background image)
+    for part_nodes, part_edges in results:
+        nodes.merge(part_nodes)
+        for k in edges.keys():
+            edges[k].extend(part_edges[k])
 
-            media_urls = list(set([x["profile_image_url"], x["background_image"]]))
+    return nodes, edges
 
-            for i, url in enumerate(media_urls):
-                # URL should not be NaN
-                if url == url:
-                    # download
-                    file_path = download_media(url=url)
-                    if file_path is None:
-                        continue
 
-                    # information given in data
-                    media = {"url": url, "type": "image", **extract_media_info(s=url)}
+def store_twitter_data(data_path: str, data_type: str = "SocialMediaPost", chunk_size: int = None, workers: int = None):
+    """
+    Store collected Twitter data in Neo4j database.
+    data_type: type of collected data (SocialMediaPosting or UserAccount)
+    chunk_size: number of records read and flushed into the database at once (default: TWITTER_CHUNK_SIZE)
+    workers: number of processes transforming records (default: TWITTER_WORKERS; 1: no worker processes)
 
-                    # add type of image properties
-                    if i == 0:
-                        media["profileImage"] = True
-                    if i == 1:
-                        media["profileBackgroundImage"] = True
+    The data is streamed in chunks, hence memory usage is bounded by the chunk size
+    (IDs of already stored records used for dropping duplicates are kept in a temporary SQLite database).
+    """
 
-                    # add basic information
-                    media.update(basic_info)
+    # check input
+    organisms = ["SocialMediaPost", "UserAccount"]
+    assert data_type in organisms, "data_type should be 'SocialMediaPost' or 'UserAccount'!"
 
-                    # add unique id
-                    media_unique_id = create_unique_id(data=media, schema="Media")
-                    media["nodeId"] = media_unique_id
+    # init
+    if chunk_size is None:
+        chunk_size = config("TWITTER_CHUNK_SIZE", default=10000, cast=int)
+    if workers is None:
+        workers = config("TWITTER_WORKERS", default=1, cast=int)
 
-                    # remove possible None and empty values
-                    media = clean_dict(d=media)
+    nodes = NodeBuffer(labels=NODE_LABELS)
 
-                    # check schema
-                    if check_schema(data=media, schema="Media"):
-                        # add node to graph
-                        nodes["Media"].append(media)
+    # IDs of already processed records (on disk)
+    processed_ids = PersistentSet()
 
-                        # add INCLUSION relationship
-                        edges["INCLUSION"].append({"a": user_account_unique_id, "b": media_unique_id})
+    # basic information of all nodes/relationships
+    basic_info = {"timestamp": get_standardized_now(), "schemaVersion": 0.1}
 
-                        # add hash value
-                        hash_value = {"hashValue": get_checksum(file=file_path)}
-
-                        # add basic information
-                        hash_value.update(basic_info)
-
-                        # add unique id
-                        hash_value_unique_id = create_unique_id(data=hash_value, schema="HashValue")
-                        hash_value["nodeId"] = hash_value_unique_id
-
-                        # remove possible None and empty values
-                        hash_value = clean_dict(d=hash_value)
-
-                        # check schema
-                        if check_schema(data=hash_value, schema="HashValue"):
-                            # add node to graph
-                            nodes["HashValue"].append(hash_value)
-                            # add INCLUSION relationship
-                            edges["INCLUSION"].append({"a": media_unique_id, "b": hash_value_unique_id})
-
-    # load data into database
-    load_graph_into_db(nodes=nodes, edges=edges)
+    # column-wise preprocessing
+    preprocess = preprocess_social_media_posts if data_type == "SocialMediaPost" else preprocess_user_accounts
+
+    # worker processes extracting nodes/links; spawned rather than forked, so they do not inherit
+    # open SQLite connections, locks or threads (e.g. of geocoding cache, media index and downloads)
+    if workers > 1:
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    else:
+        executor = None
+
+    # background downloads of media
+    downloader = MediaDownloader()
+
+    # records of previous chunk, their pending media downloads and geocoded locations
+    pending = None
+
+    with tqdm(desc=data_type + "s", unit="records") as progress:
+        # read data chunk by chunk; chunks are transformed one chunk behind, so media downloads run ahead
+        for data in itertools.chain(pd.read_csv(data_path, sep=",", header=0, chunksize=chunk_size), [None]):
+            if data is not None:
+                # drop duplicates (also across chunks)
+                data = data[processed_ids.add_new(keys=list(data["id"]))]
+
+                # geocode locations concurrently within rate limit (only in this process)
+                if data_type == "SocialMediaPost":
+                    given, addresses = "coordinates", list(data["geo"].dropna().unique())
+                else:
+                    given, addresses = "address", list(data["location"].dropna().unique())
+
+                locations = dict(zip(addresses, complete_locations(data=addresses, given=given)))
+
+                # column-wise parsing, standardization and unique ids
+                data = preprocess(data=data, basic_info=basic_info)
+
+                # start media downloads
+                if data_type == "SocialMediaPost":
+                    media_urls = [url for urls in data["photos"] for url in urls]
+                else:
+                    media_urls = list(data["profile_image_url"]) + list(data["background_image"])
+
+                downloads = downloader.submit(urls=media_urls)
+
+            if pending is not None:
+                records, pending_downloads, pending_locations = pending
+
+                # extract nodes/links for every entry
+                chunk_nodes, edges = transform_many(
+                    records=records,
+                    data_type=data_type,
+                    basic_info=basic_info,
+                    media_paths=downloader.results(futures=pending_downloads),
+                    locations=pending_locations,
+                    executor=executor,
+                )
+                nodes.merge(chunk_nodes)
+                progress.update(len(records))
+
+                # flush chunk into database
+                load_graph_into_db(nodes=nodes, edges=edges)
+                nodes.clear()
+
+            pending = (data.to_dict(orient="records"), downloads, locations) if data is not None else None
+
+    processed_ids.close()
+    downloader.shutdown()
+    if executor is not None:
+        executor.shutdown()
+
+    # duplicates are dropped before loading
+    nodes.log_duplicates()
+
+    # reuse of geocoding results
+    logging.info("Geocoding cache: %s" % get_geo_cache().stats())
+
+    # reuse of downloaded media
+    logging.info("Media index: %s" % get_media_index().stats())
+
+    # reuse of URL decompositions
+    logging.info("URL decomposition cache: %s" % url_cache_info())
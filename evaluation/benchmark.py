@@ -0,0 +1,242 @@
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from os.path import join
+from typing import List
+
+import pandas as pd
+from decouple import config
+from jsonschema import Draft7Validator, RefResolver
+from jsonschema.exceptions import ValidationError
+
+from collect.twitter import preprocess_social_media_posts, transform_many
+from helpers.data_static import is_popular_domain, load_alexa1m
+from helpers.date_time import get_standardized_now
+from helpers.extractor import extract_media_info, extract_name, extract_urls
+from helpers.hash import create_hash
+from helpers.schema import check_schema, get_validator
+
+
+# parser function to collect and pass on values from terminal
+def parser():
+    parser = argparse.ArgumentParser(description="Specify benchmark.")
+
+    parser.add_argument("--schema", help="Benchmark per-node schema validation.", action="store_true")
+    parser.add_argument("--extractor", help="Benchmark extraction of names, URLs and media.", action="store_true")
+    parser.add_argument("--scaling", help="Benchmark parallel transformation of Tweets.", action="store_true")
+    parser.add_argument("--domains", help="Benchmark filter of popular domains.", action="store_true")
+    parser.add_argument("--repeat", help="Number of repetitions.", default=10000, type=int)
+    parser.add_argument("--records", help="Number of records of synthetic corpus.", default=10000, type=int)
+    parser.add_argument("--workers", help="Maximum number of worker processes.", default=os.cpu_count(), type=int)
+
+    args = parser.parse_args()
+
+    return args.schema, args.extractor, args.scaling, args.domains, args.repeat, args.records, args.workers
+
+
+# pass on parser values
+schema, extractor, scaling, domains, repeat, records, workers = parser()
+
+
+def measure(f, repeat: int) -> float:
+    """ Average run time of f in microseconds. """
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        f()
+
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def synthetic_tweets(records: int) -> List[dict]:
+    """ Synthetic corpus of Tweets containing names, URLs and media URLs. """
+
+    random.seed(0)
+
+    given_names = ["Anna", "Ben", "Clara", "David", "Emma", "Felix", "Greta", "Hans"]
+    family_names = ["Müller", "Schmidt", "Schneider", "Fischer", "Weber", "Meyer"]
+    domains = ["bit.ly", "t.co", "spiegel.de", "zeit.de", "youtube.com", "vk.com", "example.org"]
+
+    tweets = []
+
+    for i in range(records):
+        name = random.choice(given_names) + " " + random.choice(family_names) + random.choice(["", " \U0001F600"])
+        urls = [
+            "https://" + random.choice(["", "www.", "m."]) + random.choice(domains) + "/" + str(random.randint(0, 999))
+            for _ in range(random.randint(0, 3))
+        ]
+        tweet = "Lorem ipsum #osint dolor sit amet " + " ".join(urls) + " consetetur sadipscing elitr"
+        photo = "https://pbs.twimg.com/media/%d_%dx%d.jpg" % (i, random.randint(100, 2000), random.randint(100, 2000))
+
+        tweets.append({"name": name, "tweet": tweet, "urls": urls, "photo": photo})
+
+    return tweets
+
+
+def throughput(f, data: list) -> float:
+    """ Records per second processed by f. """
+
+    start = time.perf_counter()
+    for x in data:
+        f(x)
+
+    return len(data) / (time.perf_counter() - start)
+
+
+def check_schema_uncached(data: dict, schema: str) -> bool:
+    """ Schema check reading and checking the schemas on every call (former implementation). """
+
+    # get schemas
+    with open(join(config("SCHEMA_DIR_PATH"), "Base.json"), "r") as schema_file:
+        base_schema = json.load(schema_file)
+    with open(join(config("SCHEMA_DIR_PATH"), schema + ".json"), "r") as schema_file:
+        data_schema = json.load(schema_file)
+
+    # resolve references
+    resolver = RefResolver.from_schema(base_schema)
+
+    # check if schema is valid
+    Draft7Validator.check_schema(data_schema)
+
+    # validate data
+    validator = Draft7Validator(data_schema, resolver=resolver)
+
+    try:
+        validator.validate(data)
+        return True
+    except ValidationError:
+        return False
+
+
+def benchmark_schema(repeat: int):
+    """ Per-node cost of schema validation before and after caching the validators. """
+
+    # sample node
+    username = {"username": "j_doe", "timestamp": "2020-03-30T13:38:59Z", "schemaVersion": 0.1}
+    username["nodeId"] = create_hash(s="Username" + username["username"])
+
+    # warm up caches
+    get_validator(schema="Username")
+
+    backend = config("SCHEMA_VALIDATOR", default="jsonschema")
+    results = [
+        ["uncached", measure(lambda: check_schema_uncached(data=username, schema="Username"), repeat=repeat)],
+        ["cached (%s)" % backend, measure(lambda: check_schema(data=username, schema="Username"), repeat=repeat)],
+    ]
+
+    for name, duration in results:
+        print("check_schema %-30s %10.1f µs/node" % (name, duration))
+
+
+def benchmark_extractor(records: int):
+    """ Records per second of name, URL and media extraction over synthetic Tweets. """
+
+    tweets = synthetic_tweets(records=records)
+
+    results = [
+        ["extract_name", throughput(lambda x: extract_name(s=x["name"]), data=tweets)],
+        ["extract_urls", throughput(lambda x: extract_urls(s=x["tweet"]), data=tweets)],
+        ["extract_media_info", throughput(lambda x: extract_media_info(s=x["photo"]), data=tweets)],
+    ]
+
+    for name, records_per_second in results:
+        print("%-30s %12.0f records/s" % (name, records_per_second))
+
+
+def benchmark_scaling(records: int, workers: int):
+    """ Records per second of transforming synthetic Tweets (Twint CSV) with increasing number of worker processes. """
+
+    tweets = synthetic_tweets(records=records)
+
+    # Twint CSV without media and geo coordinates (no network access)
+    data = pd.DataFrame(
+        [
+            {
+                "id": i,
+                "created_at": 1585575539000 + i * 1000,
+                "username": "user_%d" % (i % 1000),
+                "name": x["name"],
+                "tweet": x["tweet"],
+                "mentions": str(["user_%d" % ((i + 1) % 1000)]),
+                "urls": str(x["urls"]),
+                "photos": "[]",
+                "replies_count": 0,
+                "retweets_count": 0,
+                "likes_count": i % 100,
+                "hashtags": str(["#osint"]),
+                "cashtags": "[]",
+                "link": "https://twitter.com/user_%d/status/%d" % (i % 1000, i),
+                "retweet": False,
+                "geo": float("nan"),
+            }
+            for i, x in enumerate(tweets)
+        ]
+    )
+
+    basic_info = {"timestamp": get_standardized_now(), "schemaVersion": 0.1}
+    data = preprocess_social_media_posts(data=data, basic_info=basic_info)
+    records = data.to_dict(orient="records")
+
+    # serial reference
+    start = time.perf_counter()
+    serial_nodes, serial_edges = transform_many(records=records, data_type="SocialMediaPost", basic_info=basic_info)
+    duration = time.perf_counter() - start
+    print("%-10s %12.0f records/s" % ("serial", len(records) / duration))
+
+    n = 1
+    while n <= workers:
+        with ProcessPoolExecutor(max_workers=n, mp_context=multiprocessing.get_context("spawn")) as executor:
+            start = time.perf_counter()
+            nodes, edges = transform_many(
+                records=records, data_type="SocialMediaPost", basic_info=basic_info, executor=executor
+            )
+            duration = time.perf_counter() - start
+
+        identical = nodes.nodes == serial_nodes.nodes and edges == serial_edges
+        print("%-10s %12.0f records/s (identical: %s)" % ("%d workers" % n, len(records) / duration, identical))
+
+        n *= 2
+
+
+def benchmark_domains(repeat: int):
+    """ Per-URL cost of filtering popular domains: scan of a list (former implementation) and hashed set. """
+
+    alexa1m_list = list(load_alexa1m())
+
+    # domains at the end of the list and unknown domains (worst cases of a scan)
+    samples = alexa1m_list[-50:] + ["unknown-%d.example" % i for i in range(50)]
+
+    results = [
+        ["list", measure(lambda: [d in alexa1m_list for d in samples], repeat=max(1, repeat // 1000)) / len(samples)],
+        ["frozenset", measure(lambda: [is_popular_domain(domain=d) for d in samples], repeat=repeat) / len(samples)],
+    ]
+
+    for name, duration in results:
+        print("popular domain filter %-20s %12.3f µs/URL" % (name, duration))
+
+
+if __name__ == "__main__":
+    # logging
+    logging.basicConfig(
+        filename=os.path.join(config("LOG_DIR"), "benchmark.log"),
+        format=config("LOG_FORMAT"),
+        level=config("LOG_LEVEL"),
+        datefmt=config("LOG_DATEFMT"),
+    )
+
+    # execute requested benchmark
+    if schema:
+        benchmark_schema(repeat=repeat)
+    elif extractor:
+        benchmark_extractor(records=records)
+    elif scaling:
+        benchmark_scaling(records=records, workers=workers)
+    elif domains:
+        benchmark_domains(repeat=repeat)
+    else:
+        print("Please specify the benchmark you want to execute.")
@@ -16,7 +16,8 @@ from helpers.schema import check_schema, create_unique_id
 from helpers.extractor import extract_facebook_id, extract_name, extract_urls
 from helpers.misc import clean_dict
 from helpers.neo4j_db import load_graph_into_db, neo4j_connect
-from helpers.geo import complete_location
+from helpers.geo import complete_location, complete_locations
+from helpers.rate_limit import map_concurrently
 from osint_tools.vk import get_vk_id
 from osint_tools.twitter import get_twitter_user
 from osint_tools.instaloader import get_instagram_id
@@ -98,7 +99,6 @@ def cross_network_user_sample():
         if x["vk"]:
             # information given in data
             vk_user_account = {"platform": "vk", "id": get_vk_id(username=x["vk"]), "url": ("https:/vk.com/" + x["vk"])}
-            time.sleep(0.3)
 
             # add basic information
             vk_user_account.update(basic_info)
@@ -126,7 +126,14 @@ def cross_network_user_sample():
                     # add node to graph
                     nodes["Username"].append(vk_username)
                     # add INCLUSION relationship
-                    edges["INCLUSION"].append({"a": vk_user_account_unique_id, "b": vk_username_unique_id})
+                    edges["INCLUSION"].append(
+                        {
+                            "a": vk_user_account_unique_id,
+                            "b": vk_username_unique_id,
+                            "labelA": "UserAccount",
+                            "labelB": "Username",
+                        }
+                    )
                 else:
                     vk_username_unique_id = ""  # reset
             else:
@@ -173,10 +180,31 @@ def cross_network_user_sample():
                     # add node to graph
                     nodes["Username"].append(twitter_username)
                     # add INCLUSION relationships
-                    edges["INCLUSION"].append({"a": twitter_user_account_unique_id, "b": twitter_username_unique_id})
-                    edges["INCLUSION"].append({"a": vk_user_account_unique_id, "b": twitter_username_unique_id})
+                    edges["INCLUSION"].append(
+                        {
+                            "a": twitter_user_account_unique_id,
+                            "b": twitter_username_unique_id,
+                            "labelA": "UserAccount",
+                            "labelB": "Username",
+                        }
+                    )
+                    edges["INCLUSION"].append(
+                        {
+                            "a": vk_user_account_unique_id,
+                            "b": twitter_username_unique_id,
+                            "labelA": "UserAccount",
+                            "labelB": "Username",
+                        }
+                    )
                     # add CO_OCCURRENCE relationship
-                    edges["CO_OCCURRENCE"].append({"a": vk_username_unique_id, "b": twitter_username_unique_id})
+                    edges["CO_OCCURRENCE"].append(
+                        {
+                            "a": vk_username_unique_id,
+                            "b": twitter_username_unique_id,
+                            "labelA": "Username",
+                            "labelB": "Username",
+                        }
+                    )
                 else:
                     twitter_user_username_unique_id = ""  # reset
             else:
@@ -229,14 +257,38 @@ def cross_network_user_sample():
                         nodes["Username"].append(facebook_username)
                         # add INCLUSION relationship
                         edges["INCLUSION"].append(
-                            {"a": facebook_user_account_unique_id, "b": facebook_username_unique_id}
+                            {
+                                "a": facebook_user_account_unique_id,
+                                "b": facebook_username_unique_id,
+                                "labelA": "UserAccount",
+                                "labelB": "Username",
+                            }
+                        )
+                        edges["INCLUSION"].append(
+                            {
+                                "a": vk_user_account_unique_id,
+                                "b": facebook_username_unique_id,
+                                "labelA": "UserAccount",
+                                "labelB": "Username",
+                            }
                         )
-                        edges["INCLUSION"].append({"a": vk_user_account_unique_id, "b": facebook_username_unique_id})
                         # add CO_OCCURRENCE relationship
-                        edges["CO_OCCURRENCE"].append({"a": vk_username_unique_id, "b": facebook_username_unique_id})
+                        edges["CO_OCCURRENCE"].append(
+                            {
+                                "a": vk_username_unique_id,
+                                "b": facebook_username_unique_id,
+                                "labelA": "Username",
+                                "labelB": "Username",
+                            }
+                        )
                         if twitter_user_account_unique_id:
                             edges["CO_OCCURRENCE"].append(
-                                {"a": twitter_username_unique_id, "b": facebook_username_unique_id}
+                                {
+                                    "a": twitter_username_unique_id,
+                                    "b": facebook_username_unique_id,
+                                    "labelA": "Username",
+                                    "labelB": "Username",
+                                }
                             )
                     else:
                         facebook_username_unique_id = ""  # reset
@@ -290,18 +342,47 @@ def cross_network_user_sample():
                         nodes["Username"].append(instagram_username)
                         # add INCLUSION relationship
                         edges["INCLUSION"].append(
-                            {"a": instagram_user_account_unique_id, "b": instagram_username_unique_id}
+                            {
+                                "a": instagram_user_account_unique_id,
+                                "b": instagram_username_unique_id,
+                                "labelA": "UserAccount",
+                                "labelB": "Username",
+                            }
+                        )
+                        edges["INCLUSION"].append(
+                            {
+                                "a": vk_user_account_unique_id,
+                                "b": instagram_username_unique_id,
+                                "labelA": "UserAccount",
+                                "labelB": "Username",
+                            }
                         )
-                        edges["INCLUSION"].append({"a": vk_user_account_unique_id, "b": instagram_username_unique_id})
                         # add CO_OCCURRENCE relationship
-                        edges["CO_OCCURRENCE"].append({"a": vk_username_unique_id, "b": instagram_username_unique_id})
+                        edges["CO_OCCURRENCE"].append(
+                            {
+                                "a": vk_username_unique_id,
+                                "b": instagram_username_unique_id,
+                                "labelA": "Username",
+                                "labelB": "Username",
+                            }
+                        )
                         if twitter_username_unique_id:
                             edges["CO_OCCURRENCE"].append(
-                                {"a": twitter_username_unique_id, "b": instagram_username_unique_id}
+                                {
+                                    "a": twitter_username_unique_id,
+                                    "b": instagram_username_unique_id,
+                                    "labelA": "Username",
+                                    "labelB": "Username",
+                                }
                             )
                         if facebook_user_account_unique_id:
                             edges["CO_OCCURRENCE"].append(
-                                {"a": facebook_username_unique_id, "b": instagram_username_unique_id}
+                                {
+                                    "a": facebook_username_unique_id,
+                                    "b": instagram_username_unique_id,
+                                    "labelA": "Username",
+                                    "labelB": "Username",
+                                }
                             )
                     else:
                         instagram_username_unique_id = ""  # reset
@@ -339,11 +420,12 @@ def collect_connected_twitter_accounts():
         )
     )
 
-    for x in tqdm(related_information, desc="VK accounts", total=len(related_information), unit="records"):
-        # get Twitter profile
-        twitter_user = get_twitter_user(username=x["twitter"])
-        time.sleep(0.3)
+    # get Twitter profiles concurrently within rate limit
+    twitter_users = map_concurrently(get_twitter_user, [x["twitter"] for x in related_information])
 
+    for x, twitter_user in tqdm(
+        zip(related_information, twitter_users), desc="VK accounts", total=len(related_information), unit="records"
+    ):
         # store in MongoDB
         if twitter_user:
             query = {"_id": x["_id"]}
@@ -389,7 +471,19 @@ def load_in_db():
     # basic information of all nodes/relationships
     basic_info = {"timestamp": get_standardized_now(), "schemaVersion": 0.1}
 
-    for x in tqdm(related_information, desc="accounts", total=len(related_information), unit="records"):
+    # get VK IDs concurrently within rate limit
+    vk_ids = map_concurrently(get_vk_id, [x["screen_name"] for x in related_information])
+
+    # geocode locations concurrently within rate limit; results are cached for later use
+    locations = [
+        x["city"]["title"] + ", " + x["country"]["title"] for x in related_information if "city" in x and "country" in x
+    ]
+    locations += [x["twitter_profile"]["location"] for x in related_information if x["twitter_profile"]["location"]]
+    complete_locations(data=list(set(locations)), given="address")
+
+    for x, vk_id in tqdm(
+        zip(related_information, vk_ids), desc="accounts", total=len(related_information), unit="records"
+    ):
 
         # store data in network
         # init
@@ -410,10 +504,9 @@ def load_in_db():
         # information given in data
         vk_user_account = {
             "platform": "vk",
-            "id": get_vk_id(username=x["screen_name"]),
+            "id": vk_id,
             "url": ("https:/vk.com/" + x["screen_name"]),
         }
-        time.sleep(0.3)
 
         # add basic information
         vk_user_account.update(basic_info)
@@ -441,7 +534,14 @@ def load_in_db():
                 # add node to graph
                 nodes["Username"].append(vk_username)
                 # add INCLUSION relationship
-                edges["INCLUSION"].append({"a": vk_user_account_unique_id, "b": vk_username_unique_id})
+                edges["INCLUSION"].append(
+                    {
+                        "a": vk_user_account_unique_id,
+                        "b": vk_username_unique_id,
+                        "labelA": "UserAccount",
+                        "labelB": "Username",
+                    }
+                )
             else:
                 vk_username_unique_id = ""  # reset
         else:
@@ -454,7 +554,6 @@ def load_in_db():
         try:
             # information given in data
             vk_location = complete_location(data=x["city"]["title"] + ", " + x["country"]["title"], given="address")
-            time.sleep(0.3)
 
             # add basic information
             vk_location.update(basic_info)
@@ -472,11 +571,25 @@ def load_in_db():
                 nodes["Location"].append(vk_location)
 
                 # add INCLUSION relationship
-                edges["INCLUSION"].append({"a": vk_user_account_unique_id, "b": vk_location_unique_id})
+                edges["INCLUSION"].append(
+                    {
+                        "a": vk_user_account_unique_id,
+                        "b": vk_location_unique_id,
+                        "labelA": "UserAccount",
+                        "labelB": "Location",
+                    }
+                )
 
                 # add CO_OCCURRENCE relationship
                 if vk_username_unique_id:
-                    edges["CO_OCCURRENCE"].append({"a": vk_username_unique_id, "b": vk_location_unique_id})
+                    edges["CO_OCCURRENCE"].append(
+                        {
+                            "a": vk_username_unique_id,
+                            "b": vk_location_unique_id,
+                            "labelA": "Username",
+                            "labelB": "Location",
+                        }
+                    )
         except Exception as e:
             # reset
             vk_location_unique_id = ""
@@ -504,13 +617,24 @@ def load_in_db():
                 nodes["Person"].append(vk_person)
 
                 # add INCLUSION relationship
-                edges["INCLUSION"].append({"a": vk_user_account_unique_id, "b": vk_person_unique_id})
+                edges["INCLUSION"].append(
+                    {
+                        "a": vk_user_account_unique_id,
+                        "b": vk_person_unique_id,
+                        "labelA": "UserAccount",
+                        "labelB": "Person",
+                    }
+                )
 
                 # add CO_OCCURRENCE relationships
                 if vk_username_unique_id:
-                    edges["CO_OCCURRENCE"].append({"a": vk_username_unique_id, "b": vk_person_unique_id})
+                    edges["CO_OCCURRENCE"].append(
+                        {"a": vk_username_unique_id, "b": vk_person_unique_id, "labelA": "Username", "labelB": "Person"}
+                    )
                 if vk_location_unique_id:
-                    edges["CO_OCCURRENCE"].append({"a": vk_location_unique_id, "b": vk_person_unique_id})
+                    edges["CO_OCCURRENCE"].append(
+                        {"a": vk_location_unique_id, "b": vk_person_unique_id, "labelA": "Location", "labelB": "Person"}
+                    )
         except KeyError:
             # reset
             vk_person_unique_id = ""
@@ -542,15 +666,43 @@ def load_in_db():
                 nodes["Organization"].append(vk_organization)
 
                 # add INCLUSION relationship
-                edges["INCLUSION"].append({"a": vk_user_account_unique_id, "b": vk_organization_unique_id})
+                edges["INCLUSION"].append(
+                    {
+                        "a": vk_user_account_unique_id,
+                        "b": vk_organization_unique_id,
+                        "labelA": "UserAccount",
+                        "labelB": "Organization",
+                    }
+                )
 
                 # add CO_OCCURRENCE relationships
                 if vk_username_unique_id:
-                    edges["CO_OCCURRENCE"].append({"a": vk_username_unique_id, "b": vk_organization_unique_id})
+                    edges["CO_OCCURRENCE"].append(
+                        {
+                            "a": vk_username_unique_id,
+                            "b": vk_organization_unique_id,
+                            "labelA": "Username",
+                            "labelB": "Organization",
+                        }
+                    )
                 if vk_location_unique_id:
-                    edges["CO_OCCURRENCE"].append({"a": vk_location_unique_id, "b": vk_organization_unique_id})
+                    edges["CO_OCCURRENCE"].append(
+                        {
+                            "a": vk_location_unique_id,
+                            "b": vk_organization_unique_id,
+                            "labelA": "Location",
+                            "labelB": "Organization",
+                        }
+                    )
                 if vk_person_unique_id:
-                    edges["CO_OCCURRENCE"].append({"a": vk_person_unique_id, "b": vk_organization_unique_id})
+                    edges["CO_OCCURRENCE"].append(
+                        {
+                            "a": vk_person_unique_id,
+                            "b": vk_organization_unique_id,
+                            "labelA": "Person",
+                            "labelB": "Organization",
+                        }
+                    )
         except KeyError:
             # reset
             vk_organization_unique_id = ""
@@ -582,17 +734,47 @@ def load_in_db():
                     nodes["Phone"].append(vk_phone)
 
                     # add INCLUSION relationship
-                    edges["INCLUSION"].append({"a": vk_user_account_unique_id, "b": vk_phone_unique_id})
+                    edges["INCLUSION"].append(
+                        {
+                            "a": vk_user_account_unique_id,
+                            "b": vk_phone_unique_id,
+                            "labelA": "UserAccount",
+                            "labelB": "Phone",
+                        }
+                    )
 
                     # add CO_OCCURRENCE relationships
                     if vk_username_unique_id:
-                        edges["CO_OCCURRENCE"].append({"a": vk_username_unique_id, "b": vk_phone_unique_id})
+                        edges["CO_OCCURRENCE"].append(
+                            {
+                                "a": vk_username_unique_id,
+                                "b": vk_phone_unique_id,
+                                "labelA": "Username",
+                                "labelB": "Phone",
+                            }
+                        )
                     if vk_location_unique_id:
-                        edges["CO_OCCURRENCE"].append({"a": vk_location_unique_id, "b": vk_phone_unique_id})
+                        edges["CO_OCCURRENCE"].append(
+                            {
+                                "a": vk_location_unique_id,
+                                "b": vk_phone_unique_id,
+                                "labelA": "Location",
+                                "labelB": "Phone",
+                            }
+                        )
                     if vk_person_unique_id:
-                        edges["CO_OCCURRENCE"].append({"a": vk_person_unique_id, "b": vk_phone_unique_id})
+                        edges["CO_OCCURRENCE"].append(
+                            {"a": vk_person_unique_id, "b": vk_phone_unique_id, "labelA": "Person", "labelB": "Phone"}
+                        )
                     if vk_organization_unique_id:
-                        edges["CO_OCCURRENCE"].append({"a": vk_organization_unique_id, "b": vk_phone_unique_id})
+                        edges["CO_OCCURRENCE"].append(
+                            {
+                                "a": vk_organization_unique_id,
+                                "b": vk_phone_unique_id,
+                                "labelA": "Organization",
+                                "labelB": "Phone",
+                            }
+                        )
         except Exception as e:
             # reset
             vk_phone_unique_id = ""
@@ -626,21 +808,65 @@ def load_in_db():
                         nodes["Domain"].append(vk_domain)
 
                         # add INCLUSION relationship
-                        edges["INCLUSION"].append({"a": vk_user_account_unique_id, "b": vk_domain_unique_id})
+                        edges["INCLUSION"].append(
+                            {
+                                "a": vk_user_account_unique_id,
+                                "b": vk_domain_unique_id,
+                                "labelA": "UserAccount",
+                                "labelB": "Domain",
+                            }
+                        )
 
                         # add CO_OCCURRENCE relationships
                         if vk_username_unique_id:
-                            edges["CO_OCCURRENCE"].append({"a": vk_username_unique_id, "b": vk_domain_unique_id})
+                            edges["CO_OCCURRENCE"].append(
+                                {
+                                    "a": vk_username_unique_id,
+                                    "b": vk_domain_unique_id,
+                                    "labelA": "Username",
+                                    "labelB": "Domain",
+                                }
+                            )
                         if vk_location_unique_id:
-                            edges["CO_OCCURRENCE"].append({"a": vk_location_unique_id, "b": vk_domain_unique_id})
+                            edges["CO_OCCURRENCE"].append(
+                                {
+                                    "a": vk_location_unique_id,
+                                    "b": vk_domain_unique_id,
+                                    "labelA": "Location",
+                                    "labelB": "Domain",
+                                }
+                            )
                         if vk_person_unique_id:
-                            edges["CO_OCCURRENCE"].append({"a": vk_person_unique_id, "b": vk_domain_unique_id})
+                            edges["CO_OCCURRENCE"].append(
+                                {
+                                    "a": vk_person_unique_id,
+                                    "b": vk_domain_unique_id,
+                                    "labelA": "Person",
+                                    "labelB": "Domain",
+                                }
+                            )
                         if vk_organization_unique_id:
-                            edges["CO_OCCURRENCE"].append({"a": vk_organization_unique_id, "b": vk_domain_unique_id})
+                            edges["CO_OCCURRENCE"].append(
+                                {
+                                    "a": vk_organization_unique_id,
+                                    "b": vk_domain_unique_id,
+                                    "labelA": "Organization",
+                                    "labelB": "Domain",
+                                }
+                            )
                         if vk_phone_unique_id:
-                            edges["CO_OCCURRENCE"].append({"a": vk_phone_unique_id, "b": vk_domain_unique_id})
+                            edges["CO_OCCURRENCE"].append(
+                                {
+                                    "a": vk_phone_unique_id,
+                                    "b": vk_domain_unique_id,
+                                    "labelA": "Phone",
+                                    "labelB": "Domain",
+                                }
+                            )
                         for i in domains_unique_ids:
-                            edges["CO_OCCURRENCE"].append({"a": i, "b": vk_domain_unique_id})
+                            edges["CO_OCCURRENCE"].append(
+                                {"a": i, "b": vk_domain_unique_id, "labelA": "Domain", "labelB": "Domain"}
+                            )
 
                         domains_unique_ids.append(vk_domain_unique_id)
             else:
@@ -690,25 +916,69 @@ def load_in_db():
                 nodes["Username"].append(vk_additional_username)
 
                 # add INCLUSION relationship
-                edges["INCLUSION"].append({"a": vk_user_account_unique_id, "b": vk_additional_username_unique_id})
+                edges["INCLUSION"].append(
+                    {
+                        "a": vk_user_account_unique_id,
+                        "b": vk_additional_username_unique_id,
+                        "labelA": "UserAccount",
+                        "labelB": "Username",
+                    }
+                )
 
                 # add CO_OCCURRENCE relationships
                 if vk_username_unique_id:
-                    edges["CO_OCCURRENCE"].append({"a": vk_username_unique_id, "b": vk_additional_username_unique_id})
+                    edges["CO_OCCURRENCE"].append(
+                        {
+                            "a": vk_username_unique_id,
+                            "b": vk_additional_username_unique_id,
+                            "labelA": "Username",
+                            "labelB": "Username",
+                        }
+                    )
                 if vk_location_unique_id:
-                    edges["CO_OCCURRENCE"].append({"a": vk_location_unique_id, "b": vk_additional_username_unique_id})
+                    edges["CO_OCCURRENCE"].append(
+                        {
+                            "a": vk_location_unique_id,
+                            "b": vk_additional_username_unique_id,
+                            "labelA": "Location",
+                            "labelB": "Username",
+                        }
+                    )
                 if vk_person_unique_id:
-                    edges["CO_OCCURRENCE"].append({"a": vk_person_unique_id, "b": vk_additional_username_unique_id})
+                    edges["CO_OCCURRENCE"].append(
+                        {
+                            "a": vk_person_unique_id,
+                            "b": vk_additional_username_unique_id,
+                            "labelA": "Person",
+                            "labelB": "Username",
+                        }
+                    )
                 if vk_organization_unique_id:
                     edges["CO_OCCURRENCE"].append(
-                        {"a": vk_organization_unique_id, "b": vk_additional_username_unique_id}
+                        {
+                            "a": vk_organization_unique_id,
+                            "b": vk_additional_username_unique_id,
+                            "labelA": "Organization",
+                            "labelB": "Username",
+                        }
                     )
                 if vk_phone_unique_id:
-                    edges["CO_OCCURRENCE"].append({"a": vk_phone_unique_id, "b": vk_additional_username_unique_id})
+                    edges["CO_OCCURRENCE"].append(
+                        {
+                            "a": vk_phone_unique_id,
+                            "b": vk_additional_username_unique_id,
+                            "labelA": "Phone",
+                            "labelB": "Username",
+                        }
+                    )
                 for i in domains_unique_ids:
-                    edges["CO_OCCURRENCE"].append({"a": i, "b": vk_additional_username_unique_id})
+                    edges["CO_OCCURRENCE"].append(
+                        {"a": i, "b": vk_additional_username_unique_id, "labelA": "Domain", "labelB": "Username"}
+                    )
                 for i in additional_usernames_unique_ids:
-                    edges["CO_OCCURRENCE"].append({"a": i, "b": vk_additional_username_unique_id})
+                    edges["CO_OCCURRENCE"].append(
+                        {"a": i, "b": vk_additional_username_unique_id, "labelA": "Username", "labelB": "Username"}
+                    )
 
                 additional_usernames_unique_ids.append(vk_additional_username_unique_id)
 
@@ -748,7 +1018,14 @@ def load_in_db():
                 # add node to graph
                 nodes["Username"].append(twitter_username)
                 # add INCLUSION relationships
-                edges["INCLUSION"].append({"a": twitter_user_account_unique_id, "b": twitter_username_unique_id})
+                edges["INCLUSION"].append(
+                    {
+                        "a": twitter_user_account_unique_id,
+                        "b": twitter_username_unique_id,
+                        "labelA": "UserAccount",
+                        "labelB": "Username",
+                    }
+                )
             else:
                 twitter_username_unique_id = ""  # reset
         else:
@@ -761,7 +1038,6 @@ def load_in_db():
         if x["twitter_profile"]["location"]:
             # information given in data
             twitter_location = complete_location(data=x["twitter_profile"]["location"], given="address")
-            time.sleep(0.3)
 
             if twitter_location:
                 # add basic information
@@ -780,12 +1056,24 @@ def load_in_db():
                     nodes["Location"].append(twitter_location)
 
                     # add INCLUSION relationship
-                    edges["INCLUSION"].append({"a": twitter_user_account_unique_id, "b": twitter_location_unique_id})
+                    edges["INCLUSION"].append(
+                        {
+                            "a": twitter_user_account_unique_id,
+                            "b": twitter_location_unique_id,
+                            "labelA": "UserAccount",
+                            "labelB": "Location",
+                        }
+                    )
 
                     # add CO_OCCURRENCE relationship
                     if twitter_username_unique_id:
                         edges["CO_OCCURRENCE"].append(
-                            {"a": twitter_username_unique_id, "b": twitter_location_unique_id}
+                            {
+                                "a": twitter_username_unique_id,
+                                "b": twitter_location_unique_id,
+                                "labelA": "Username",
+                                "labelB": "Location",
+                            }
                         )
             else:
                 # reset
@@ -817,13 +1105,34 @@ def load_in_db():
                 nodes["Person"].append(twitter_person)
 
                 # add INCLUSION relationship
-                edges["INCLUSION"].append({"a": twitter_user_account_unique_id, "b": twitter_person_unique_id})
+                edges["INCLUSION"].append(
+                    {
+                        "a": twitter_user_account_unique_id,
+                        "b": twitter_person_unique_id,
+                        "labelA": "UserAccount",
+                        "labelB": "Person",
+                    }
+                )
 
                 # add CO_OCCURRENCE relationships
                 if twitter_username_unique_id:
-                    edges["CO_OCCURRENCE"].append({"a": twitter_username_unique_id, "b": twitter_person_unique_id})
+                    edges["CO_OCCURRENCE"].append(
+                        {
+                            "a": twitter_username_unique_id,
+                            "b": twitter_person_unique_id,
+                            "labelA": "Username",
+                            "labelB": "Person",
+                        }
+                    )
                 if twitter_location_unique_id:
-                    edges["CO_OCCURRENCE"].append({"a": twitter_location_unique_id, "b": twitter_person_unique_id})
+                    edges["CO_OCCURRENCE"].append(
+                        {
+                            "a": twitter_location_unique_id,
+                            "b": twitter_person_unique_id,
+                            "labelA": "Location",
+                            "labelB": "Person",
+                        }
+                    )
         else:
             # reset
             twitter_person_unique_id = ""
@@ -857,23 +1166,47 @@ def load_in_db():
                         nodes["Domain"].append(twitter_domain)
 
                         # add INCLUSION relationship
-                        edges["INCLUSION"].append({"a": twitter_user_account_unique_id, "b": twitter_domain_unique_id})
+                        edges["INCLUSION"].append(
+                            {
+                                "a": twitter_user_account_unique_id,
+                                "b": twitter_domain_unique_id,
+                                "labelA": "UserAccount",
+                                "labelB": "Domain",
+                            }
+                        )
 
                         # add CO_OCCURRENCE relationships
                         if twitter_username_unique_id:
                             edges["CO_OCCURRENCE"].append(
-                                {"a": twitter_username_unique_id, "b": twitter_domain_unique_id}
+                                {
+                                    "a": twitter_username_unique_id,
+                                    "b": twitter_domain_unique_id,
+                                    "labelA": "Username",
+                                    "labelB": "Domain",
+                                }
                             )
                         if twitter_location_unique_id:
                             edges["CO_OCCURRENCE"].append(
-                                {"a": twitter_location_unique_id, "b": twitter_domain_unique_id}
+                                {
+                                    "a": twitter_location_unique_id,
+                                    "b": twitter_domain_unique_id,
+                                    "labelA": "Location",
+                                    "labelB": "Domain",
+                                }
                             )
                         if twitter_person_unique_id:
                             edges["CO_OCCURRENCE"].append(
-                                {"a": twitter_person_unique_id, "b": twitter_domain_unique_id}
+                                {
+                                    "a": twitter_person_unique_id,
+                                    "b": twitter_domain_unique_id,
+                                    "labelA": "Person",
+                                    "labelB": "Domain",
+                                }
                             )
                         for i in domains_unique_ids:
-                            edges["CO_OCCURRENCE"].append({"a": i, "b": twitter_domain_unique_id})
+                            edges["CO_OCCURRENCE"].append(
+                                {"a": i, "b": twitter_domain_unique_id, "labelA": "Domain", "labelB": "Domain"}
+                            )
 
                         domains_unique_ids.append(twitter_domain_unique_id)
             else:
@@ -0,0 +1,65 @@
+import logging
+from typing import Dict, List
+
+
+class NodeBuffer:
+    """
+    Buffer of nodes per label keyed by nodeId.
+    Only the properties seen first are kept, in line with 'ON CREATE SET' during loading into the database.
+    Can be passed to load_graph_into_db like a dictionary of node lists.
+    """
+
+    def __init__(self, labels: List[str]):
+        self.nodes = {label: dict() for label in labels}
+
+        # counters of dropped duplicates per label
+        self.duplicates = {label: 0 for label in labels}
+
+    def append(self, label: str, node: dict) -> bool:
+        """ Add node to buffer. Returns False if node with same nodeId has already been added. """
+
+        if node["nodeId"] in self.nodes[label]:
+            self.duplicates[label] += 1
+            return False
+
+        self.nodes[label][node["nodeId"]] = node
+        return True
+
+    def merge(self, other: "NodeBuffer"):
+        """ Append all nodes of other buffer (in their order) as well as its counters of dropped duplicates. """
+
+        for label, nodes in other.nodes.items():
+            self.nodes.setdefault(label, dict())
+            self.duplicates.setdefault(label, 0)
+
+            for node in nodes.values():
+                self.append(label, node)
+
+        for label, count in other.duplicates.items():
+            self.duplicates[label] += count
+
+    def keys(self) -> List[str]:
+        """ Labels of buffered nodes. """
+
+        return list(self.nodes.keys())
+
+    def __getitem__(self, label: str) -> List[dict]:
+        return list(self.nodes[label].values())
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self.nodes.values())
+
+    def clear(self):
+        """ Remove all buffered nodes; counters are kept. """
+
+        for label in self.nodes.keys():
+            self.nodes[label] = dict()
+
+    def log_duplicates(self) -> Dict[str, int]:
+        """ Log and return number of dropped duplicates per label. """
+
+        for label, count in self.duplicates.items():
+            if count:
+                logging.info("Dropped %d duplicate %s nodes" % (count, label))
+
+        return self.duplicates
@@ -0,0 +1,145 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List
+
+
+class PersistentCache:
+    """
+    Persistent key-value cache backed by SQLite; values have to be JSON serializable.
+    Entries expire after ttl seconds (None: never). If more than max_entries are stored,
+    the least recently used entries are evicted (None: no limit).
+    """
+
+    # check size limit every n insertions
+    eviction_interval = 100
+
+    def __init__(self, path: str, ttl: float = None, max_entries: int = None):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        # statistics
+        self.hits = 0
+        self.misses = 0
+        self.insertions = 0
+
+        # connection shared by threads
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+
+        with self.lock, self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, created REAL, accessed REAL)"
+            )
+            self.connection.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)")
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """ Return cached value of key or default if not available or expired. """
+
+        now = time.time()
+
+        with self.lock, self.connection:
+            row = self.connection.execute("SELECT value, created FROM cache WHERE key = ?", (key,)).fetchone()
+
+            if row is None or (self.ttl is not None and row[1] + self.ttl < now):
+                self.misses += 1
+                return default
+
+            # update access time (LRU)
+            self.connection.execute("UPDATE cache SET accessed = ? WHERE key = ?", (now, key))
+
+        self.hits += 1
+
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any):
+        """ Store value of key. """
+
+        now = time.time()
+
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO cache (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now),
+            )
+            self.insertions += 1
+
+        if self.insertions % self.eviction_interval == 0:
+            self.evict()
+
+    def evict(self):
+        """ Remove expired entries and least recently used entries exceeding the size limit. """
+
+        with self.lock, self.connection:
+            if self.ttl is not None:
+                self.connection.execute("DELETE FROM cache WHERE created < ?", (time.time() - self.ttl,))
+
+            if self.max_entries is not None:
+                self.connection.execute(
+                    "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+
+    def stats(self) -> Dict[str, Any]:
+        """ Hit/miss statistics. """
+
+        requests = self.hits + self.misses
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": (self.hits / requests) if requests else 0,
+        }
+
+    def close(self):
+        """ Close database connection. """
+
+        with self.lock:
+            self.connection.close()
+
+
+class PersistentSet:
+    """
+    Set of keys backed by SQLite, e.g. for dropping duplicates of streamed data with memory bounded by the
+    size of the streamed chunks. Without path, a temporary database is used which is deleted when closed.
+    """
+
+    # maximum number of keys per query (SQLite limits number of variables)
+    query_size = 500
+
+    def __init__(self, path: str = ""):
+        self.path = path
+        self.connection = sqlite3.connect(path, timeout=30)
+
+        with self.connection:
+            self.connection.execute("CREATE TABLE IF NOT EXISTS keys (key TEXT PRIMARY KEY)")
+
+    def add_new(self, keys: List[Any]) -> List[bool]:
+        """ Add keys; returns mask of keys not seen before (repeated keys only count at their first occurrence). """
+
+        keys = [str(k) for k in keys]
+        distinct = list(dict.fromkeys(keys))
+
+        # already stored keys
+        seen = set()
+        for i in range(0, len(distinct), self.query_size):
+            part = distinct[i : i + self.query_size]
+            query = "SELECT key FROM keys WHERE key IN (%s)" % ",".join("?" * len(part))
+            seen.update(row[0] for row in self.connection.execute(query, part))
+
+        with self.connection:
+            self.connection.executemany("INSERT INTO keys (key) VALUES (?)", [(k,) for k in distinct if k not in seen])
+
+        mask = []
+        for k in keys:
+            mask.append(k not in seen)
+            seen.add(k)
+
+        return mask
+
+    def close(self):
+        """ Close database connection. """
+
+        self.connection.close()
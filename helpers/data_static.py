@@ -1,12 +1,60 @@
+import logging
 import os
+import pickle
+from functools import lru_cache
+from typing import FrozenSet
 
 import pandas as pd
 from decouple import config
 
-# Alexa 1 Mio
-ALEXA1M = pd.read_csv(os.path.join(config("DATA_DIR"), "./top-1m-alexa.csv"), sep=",", header=None, skiprows=1)[
-    1
-].to_list()
-
 # Social Media Platforms
-SOCIAL_MEDIA_PLATFORMS = ["youtube", "facebook", "reddit", "vk", "instagram", "twitter"]
\ No newline at end of file
+SOCIAL_MEDIA_PLATFORMS = ["youtube", "facebook", "reddit", "vk", "instagram", "twitter"]
+
+
+@lru_cache(maxsize=None)
+def load_alexa1m() -> FrozenSet[str]:
+    """
+    Alexa 1 Mio (hashed set for constant-time membership checks), loaded on first use.
+    The parsed CSV is cached in a pickle file next to it, which is rebuilt if the CSV has been modified.
+    """
+
+    csv_path = os.path.join(config("DATA_DIR"), "top-1m-alexa.csv")
+    cache_path = csv_path + ".pickle"
+    mtime = os.stat(csv_path).st_mtime_ns
+
+    # preprocessed cache
+    try:
+        with open(cache_path, "rb") as f:
+            cached = pickle.load(f)
+
+        if cached["mtime"] == mtime:
+            return cached["domains"]
+    except (OSError, EOFError, KeyError, pickle.UnpicklingError):
+        pass
+
+    domains = frozenset(pd.read_csv(csv_path, sep=",", header=None, skiprows=1)[1])
+
+    # write cache atomically
+    try:
+        with open(cache_path + ".tmp", "wb") as f:
+            pickle.dump({"mtime": mtime, "domains": domains}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(cache_path + ".tmp", cache_path)
+    except OSError:
+        logging.warning("Could not write cache of Alexa 1 Mio: %s" % cache_path)
+
+    return domains
+
+
+def is_popular_domain(domain: str) -> bool:
+    """ Checks whether domain is among the Alexa top 1 million domains (large webpages). """
+
+    return domain in load_alexa1m()
+
+
+def __getattr__(name: str):
+    """ Lazily loaded datasets, e.g. ALEXA1M. """
+
+    if name == "ALEXA1M":
+        return load_alexa1m()
+
+    raise AttributeError("module %s has no attribute %s" % (__name__, name))
@@ -1,5 +1,8 @@
 import datetime
 
+import pandas as pd
+from dateutil.tz import tzlocal
+
 
 def standardize_date_time(date_time: str, timestamp: bool = False, format: str = "") -> str:
     """ Standardize date time to be in line with ISO 8601 """
@@ -14,6 +17,17 @@ def standardize_date_time(date_time: str, timestamp: bool = False, format: str =
     return str(iso_dt) + "Z"
 
 
+def standardize_date_times(date_times: pd.Series, timestamp: bool = False, format: str = "") -> pd.Series:
+    """ Standardize a column of date times at once (see standardize_date_time); timestamps are given in local time. """
+
+    if timestamp:
+        dt = pd.to_datetime(date_times.astype("int64"), unit="s", utc=True).dt.tz_convert(tzlocal())
+    else:
+        dt = pd.to_datetime(date_times, format=format)
+
+    return dt.dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
 def get_standardized_now() -> str:
     """ Standardized date time of 'now' in line with ISO 8601 """
 
@@ -1,12 +1,166 @@
 import re
-from typing import Dict
+from functools import lru_cache
+from typing import Dict, Iterable, List
 
 import tldextract
+from decouple import config
 
 from helpers.data_static import SOCIAL_MEDIA_PLATFORMS
 from helpers.misc import remove_emojis
 
 
+# file extensions of media
+MEDIA_EXTENSIONS = (
+    "odt",
+    "sh",
+    "tif",
+    "swift",
+    "csv",
+    "part",
+    "avi",
+    "ico",
+    "mpeg",
+    "docx",
+    "odp",
+    "emlx",
+    "rss",
+    "m4v",
+    "mp4",
+    "js",
+    "fnt",
+    "mp3",
+    "class",
+    "doc",
+    "ogg",
+    "msg",
+    "cs",
+    "arj",
+    "cgi",
+    "7z",
+    "ttf",
+    "oft",
+    "jsp",
+    "3gp",
+    "pl",
+    "html",
+    "cpp",
+    "h",
+    "midi",
+    "dmg",
+    "fon",
+    "asp",
+    "cda",
+    "bin",
+    "cab",
+    "flv",
+    "ai",
+    "pst",
+    "c",
+    "ini",
+    "tar",
+    "sql",
+    "mpg",
+    "cfg",
+    "htm",
+    "xls",
+    "vcf",
+    "dat",
+    "exe",
+    "sys",
+    "com",
+    "pptx",
+    "ppt",
+    "apk",
+    "icns",
+    "otf",
+    "pdf",
+    "ps",
+    "gadget",
+    "vob",
+    "tiff",
+    "mov",
+    "tar.gz",
+    "php",
+    "jpeg",
+    "aif",
+    "java",
+    "swf",
+    "3g2",
+    "wmv",
+    "mpa",
+    "lnk",
+    "aspx",
+    "dbf",
+    "ost",
+    "mid",
+    "jar",
+    "wav",
+    "png",
+    "xlsm",
+    "cfm",
+    "deb",
+    "drv",
+    "tmp",
+    "cur",
+    "sav",
+    "z",
+    "h264",
+    "rar",
+    "eml",
+    "wma",
+    "msi",
+    "rtf",
+    "wsf",
+    "bmp",
+    "vcd",
+    "gif",
+    "xml",
+    "dll",
+    "jpg",
+    "pkg",
+    "css",
+    "psd",
+    "txt",
+    "mdb",
+    "vb",
+    "bat",
+    "pps",
+    "wpd",
+    "cpl",
+    "email",
+    "xlsx",
+    "zip",
+    "bak",
+    "cer",
+    "svg",
+    "db",
+    "rm",
+    "wpl",
+    "py",
+    "rpm",
+    "ods",
+    "iso",
+    "xhtml",
+    "tex",
+    "toast",
+    "log",
+    "mkv",
+    "dmp",
+    "key",
+)
+
+# dimensions of media, e.g. 'image_1024x768.jpg'
+DIMENSIONS_PATTERN = re.compile(r"[1-9]\d{1,4}x[1-9]\d+")
+
+# URLs (including IPv4/IPv6 addresses)
+URL_PATTERN = re.compile(
+    r"\b((?:https?://)?(?:(?:www\.)?(?:[\da-z\.-]+)\.(?:[a-z]{2,6})|(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)|(?:(?:[0-9a-fA-F]{1,4}:){7,7}[0-9a-fA-F]{1,4}|(?:[0-9a-fA-F]{1,4}:){1,7}:|(?:[0-9a-fA-F]{1,4}:){1,6}:[0-9a-fA-F]{1,4}|(?:[0-9a-fA-F]{1,4}:){1,5}(?::[0-9a-fA-F]{1,4}){1,2}|(?:[0-9a-fA-F]{1,4}:){1,4}(?::[0-9a-fA-F]{1,4}){1,3}|(?:[0-9a-fA-F]{1,4}:){1,3}(?::[0-9a-fA-F]{1,4}){1,4}|(?:[0-9a-fA-F]{1,4}:){1,2}(?::[0-9a-fA-F]{1,4}){1,5}|[0-9a-fA-F]{1,4}:(?:(?::[0-9a-fA-F]{1,4}){1,6})|:(?:(?::[0-9a-fA-F]{1,4}){1,7}|:)|fe80:(?::[0-9a-fA-F]{0,4}){0,4}%[0-9a-zA-Z]{1,}|::(?:ffff(?::0{1,4}){0,1}:){0,1}(?:(?:25[0-5]|(?:2[0-4]|1{0,1}[0-9]){0,1}[0-9])\.){3,3}(?:25[0-5]|(?:2[0-4]|1{0,1}[0-9]){0,1}[0-9])|(?:[0-9a-fA-F]{1,4}:){1,4}:(?:(?:25[0-5]|(?:2[0-4]|1{0,1}[0-9]){0,1}[0-9])\.){3,3}(?:25[0-5]|(?:2[0-4]|1{0,1}[0-9]){0,1}[0-9])))(?::[0-9]{1,4}|[1-5][0-9]{4}|6[0-4][0-9]{3}|65[0-4][0-9]{2}|655[0-2][0-9]|6553[0-5])?(?:/[\w\.-]*)*/?)\b"
+)
+
+# scheme of URLs, e.g. 'https://'
+SCHEME_PATTERN = re.compile(r"^([a-z][a-z0-9+\-.]*:)?//", re.IGNORECASE)
+
+
 def extract_name(s: str) -> dict:
     """ Extract name properties from string. """
 
@@ -34,145 +188,6 @@ def extract_media_info(s: str) -> dict:
     ###############################################################################################
     # format
 
-    extensions = (
-        "odt",
-        "sh",
-        "tif",
-        "swift",
-        "csv",
-        "part",
-        "avi",
-        "ico",
-        "mpeg",
-        "docx",
-        "odp",
-        "emlx",
-        "rss",
-        "m4v",
-        "mp4",
-        "js",
-        "fnt",
-        "mp3",
-        "class",
-        "doc",
-        "ogg",
-        "msg",
-        "cs",
-        "arj",
-        "cgi",
-        "7z",
-        "ttf",
-        "oft",
-        "jsp",
-        "3gp",
-        "pl",
-        "html",
-        "cpp",
-        "h",
-        "midi",
-        "dmg",
-        "fon",
-        "asp",
-        "cda",
-        "bin",
-        "cab",
-        "flv",
-        "ai",
-        "pst",
-        "c",
-        "ini",
-        "tar",
-        "sql",
-        "mpg",
-        "cfg",
-        "htm",
-        "xls",
-        "vcf",
-        "dat",
-        "exe",
-        "sys",
-        "com",
-        "pptx",
-        "ppt",
-        "apk",
-        "icns",
-        "otf",
-        "pdf",
-        "ps",
-        "gadget",
-        "vob",
-        "tiff",
-        "mov",
-        "tar.gz",
-        "php",
-        "jpeg",
-        "aif",
-        "java",
-        "swf",
-        "3g2",
-        "wmv",
-        "mpa",
-        "lnk",
-        "aspx",
-        "dbf",
-        "ost",
-        "mid",
-        "jar",
-        "wav",
-        "png",
-        "xlsm",
-        "cfm",
-        "deb",
-        "drv",
-        "tmp",
-        "cur",
-        "sav",
-        "z",
-        "h264",
-        "rar",
-        "eml",
-        "wma",
-        "msi",
-        "rtf",
-        "wsf",
-        "bmp",
-        "vcd",
-        "gif",
-        "xml",
-        "dll",
-        "jpg",
-        "pkg",
-        "css",
-        "psd",
-        "txt",
-        "mdb",
-        "vb",
-        "bat",
-        "pps",
-        "wpd",
-        "cpl",
-        "email",
-        "xlsx",
-        "zip",
-        "bak",
-        "cer",
-        "svg",
-        "db",
-        "rm",
-        "wpl",
-        "py",
-        "rpm",
-        "ods",
-        "iso",
-        "xhtml",
-        "tex",
-        "toast",
-        "log",
-        "mkv",
-        "dmp",
-        "key",
-    )
-
     # handle url case
     url_split = s.split("/")
     if len(url_split) > 1:
@@ -182,7 +197,7 @@ def extract_media_info(s: str) -> dict:
     s = s.split("?")[0]
 
     # extract format
-    if s.endswith(extensions):
+    if s.endswith(MEDIA_EXTENSIONS):
         extensions_split = s.split(".")
         # handle case 'www.test.com'; com is also extension
         if len(extensions_split) == 2:
@@ -191,7 +206,7 @@ def extract_media_info(s: str) -> dict:
     ###############################################################################################
     # dimensions
 
-    dimensions = re.findall(r"[1-9]\d{1,4}x[1-9]\d+", s)
+    dimensions = DIMENSIONS_PATTERN.findall(s)
     if len(dimensions) > 0:
         dimensions = dimensions[0].split("x")
         result["width"] = int(dimensions[0])
@@ -200,52 +215,149 @@ def extract_media_info(s: str) -> dict:
     return result
 
 
+@lru_cache(maxsize=None)
+def get_tld_extractor() -> tldextract.TLDExtract:
+    """ Extractor of top-level domains using the bundled snapshot of the public suffix list (no network access). """
+
+    return tldextract.TLDExtract(suffix_list_urls=None, cache_file=False)
+
+
+def get_host(url: str) -> str:
+    """ Host of URL like tldextract determines it, e.g. 'https://user@www.example.com:80/path' -> 'www.example.com'. """
+
+    netloc = SCHEME_PATTERN.sub("", url).partition("/")[0].partition("?")[0].partition("#")[0]
+
+    return netloc.split("@")[-1].partition(":")[0].strip().rstrip(".")
+
+
+@lru_cache(maxsize=config("URL_HOST_CACHE_SIZE", default=100000, cast=int))
+def split_host(host: str) -> tldextract.tldextract.ExtractResult:
+    """ Split host in subdomain, domain and suffix; memoised as hosts recur often. """
+
+    return get_tld_extractor()(host)
+
+
+def build_url_components(u: str, ext: tldextract.tldextract.ExtractResult) -> Dict[str, str]:
+    """ Components of URL given the split host (None if URL has no registered domain). """
+
+    domain = ext.registered_domain
+    if domain == "":
+        return None
+    elif ext.subdomain:
+        subdomain = ext.subdomain + "." + ext.registered_domain
+    else:
+        subdomain = ""
+
+    # extract username from URL, e.g., vk.com/john_doe
+    username = ""
+    platform = ext.domain
+    if platform in SOCIAL_MEDIA_PLATFORMS:
+        url = u
+        if platform == "youtube" and url.split("/")[-1] == "featured":
+            url = "/".join(url.split("/")[:-1])
+        if url[-1] == "/":
+            url = url[:-1]
+
+        username = url.split("/")[-1]
+
+    # extract path from url
+    path = u.split(domain)[-1]
+
+    return {
+        "domain": ext.registered_domain,
+        "subdomain": subdomain,
+        "username": username,
+        "platform": platform if username else "",
+        "path": path,
+    }
+
+
+@lru_cache(maxsize=config("URL_CACHE_SIZE", default=1000000, cast=int))
+def decompose_url(u: str) -> Dict[str, str]:
+    """ Components of URL (None if URL has no registered domain); memoised as URLs recur often. """
+
+    return build_url_components(u=u, ext=split_host(host=get_host(url=u)))
+
+
+def url_cache_info() -> Dict[str, dict]:
+    """ Hit/miss statistics of the memoised URL decomposition (per URL and per host). """
+
+    result = dict()
+
+    for name, f in [("url", decompose_url), ("host", split_host)]:
+        info = f.cache_info()
+        requests = info.hits + info.misses
+
+        result[name] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "hitRate": (info.hits / requests) if requests else 0,
+            "size": info.currsize,
+            "maxSize": info.maxsize,
+        }
+
+    return result
+
+
 def extract_urls(s: str) -> Dict[str, Dict[str, str]]:
     """ Extracting URLs and its components. """
 
     # extract URLs
-    url_pattern = re.compile(
-        r"\b((?:https?://)?(?:(?:www\.)?(?:[\da-z\.-]+)\.(?:[a-z]{2,6})|(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)|(?:(?:[0-9a-fA-F]{1,4}:){7,7}[0-9a-fA-F]{1,4}|(?:[0-9a-fA-F]{1,4}:){1,7}:|(?:[0-9a-fA-F]{1,4}:){1,6}:[0-9a-fA-F]{1,4}|(?:[0-9a-fA-F]{1,4}:){1,5}(?::[0-9a-fA-F]{1,4}){1,2}|(?:[0-9a-fA-F]{1,4}:){1,4}(?::[0-9a-fA-F]{1,4}){1,3}|(?:[0-9a-fA-F]{1,4}:){1,3}(?::[0-9a-fA-F]{1,4}){1,4}|(?:[0-9a-fA-F]{1,4}:){1,2}(?::[0-9a-fA-F]{1,4}){1,5}|[0-9a-fA-F]{1,4}:(?:(?::[0-9a-fA-F]{1,4}){1,6})|:(?:(?::[0-9a-fA-F]{1,4}){1,7}|:)|fe80:(?::[0-9a-fA-F]{0,4}){0,4}%[0-9a-zA-Z]{1,}|::(?:ffff(?::0{1,4}){0,1}:){0,1}(?:(?:25[0-5]|(?:2[0-4]|1{0,1}[0-9]){0,1}[0-9])\.){3,3}(?:25[0-5]|(?:2[0-4]|1{0,1}[0-9]){0,1}[0-9])|(?:[0-9a-fA-F]{1,4}:){1,4}:(?:(?:25[0-5]|(?:2[0-4]|1{0,1}[0-9]){0,1}[0-9])\.){3,3}(?:25[0-5]|(?:2[0-4]|1{0,1}[0-9]){0,1}[0-9])))(?::[0-9]{1,4}|[1-5][0-9]{4}|6[0-4][0-9]{3}|65[0-4][0-9]{2}|655[0-2][0-9]|6553[0-5])?(?:/[\w\.-]*)*/?)\b"
-    )
-    urls_in_string = url_pattern.findall(s)
+    urls_in_string = URL_PATTERN.findall(s)
 
     result = dict()
 
     # split URL in components
     for u in urls_in_string:
-        # extract
-        ext = tldextract.extract(u)
-        domain = ext.registered_domain
-        if domain == "":
+        components = decompose_url(u=u)
+        if components is None:
             continue
-        elif ext.subdomain:
-            subdomain = ext.subdomain + "." + ext.registered_domain
-        else:
-            subdomain = ""
-
-        # extract username from URL, e.g., vk.com/john_doe
-        username = ""
-        platform = ext.domain
-        if platform in SOCIAL_MEDIA_PLATFORMS:
-            url = u
-            if platform == "youtube" and url.split("/")[-1] == "featured":
-                url = "/".join(url.split("/")[:-1])
-            if url[-1] == "/":
-                url = url[:-1]
-
-            username = url.split("/")[-1]
-
-        # extract path from url
-        path = u.split(domain)[-1]
-
-        # store
-        result[u] = {
-            "domain": ext.registered_domain,
-            "subdomain": subdomain,
-            "username": username,
-            "platform": platform if username else "",
-            "path": path,
-        }
+
+        # store (copy of memoised components)
+        result[u] = dict(components)
+
+    return result
+
+
+def extract_urls_many(texts: Iterable[str]) -> Dict[str, List]:
+    """
+    Extracting URLs and its components of many texts at once (NaN texts are skipped).
+    Every distinct host is split only once. The result is columnar, i.e. lists of equal length
+    ('index': position of text, 'url', 'domain', 'subdomain', 'username', 'platform', 'path').
+    """
+
+    # extract URLs (distinct per text, as in extract_urls)
+    indices = []
+    urls = []
+
+    for i, s in enumerate(texts):
+        # text should not be NaN
+        if s != s:
+            continue
+
+        for u in dict.fromkeys(URL_PATTERN.findall(s)):
+            indices.append(i)
+            urls.append(u)
+
+    # split distinct hosts
+    hosts = {u: get_host(url=u) for u in set(urls)}
+    splits = {host: split_host(host=host) for host in set(hosts.values())}
+
+    components = {u: build_url_components(u=u, ext=splits[host]) for u, host in hosts.items()}
+
+    # columns
+    columns = ["domain", "subdomain", "username", "platform", "path"]
+    result = {k: [] for k in ["index", "url"] + columns}
+
+    for i, u in zip(indices, urls):
+        c = components[u]
+        if c is None:
+            continue
+
+        result["index"].append(i)
+        result["url"].append(u)
+        for k in columns:
+            result[k].append(c[k])
 
     return result
 
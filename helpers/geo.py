@@ -1,28 +1,72 @@
 import logging
+import os
 import random
+import re
 import string
-import time
-from functools import partial
+from functools import lru_cache, partial
+from typing import List
 
+from decouple import config
 from geopy.geocoders import Nominatim
 
+from helpers.cache import PersistentCache
+from helpers.geo_offline import get_offline_geocoder
 from helpers.misc import clean_dict
+from helpers.rate_limit import get_rate_limiter, map_concurrently
+
+# marker for values missing in cache
+MISSING = object()
+
+
+@lru_cache(maxsize=None)
+def get_geo_cache() -> PersistentCache:
+    """ Persistent cache of geocoding results (configured by GEO_CACHE_TTL in days and GEO_CACHE_SIZE). """
+
+    return PersistentCache(
+        path=os.path.join(config("DATA_DIR"), "geo_cache.sqlite"),
+        ttl=config("GEO_CACHE_TTL", default=90, cast=float) * 24 * 60 * 60,
+        max_entries=config("GEO_CACHE_SIZE", default=1000000, cast=int),
+    )
+
+
+def normalize_address(address: str) -> str:
+    """ Normalize address used as cache key, e.g. ' Berlin,  Germany' -> 'berlin, germany'. """
+
+    return re.sub(r"\s+", " ", address).strip().lower()
+
+
+def normalize_coordinates(coordinates: str, precision: int = 4) -> str:
+    """ Round coordinates used as cache key, e.g. '52.509669,13.376294' -> '52.5097, 13.3763'. """
+
+    return ", ".join(["%.*f" % (precision, float(c)) for c in coordinates.split(",")])
 
 
 def address_to_coordinates(address: str) -> str:
     """ Get geo coordinates from postal address. """
 
+    # check cache
+    key = "address:" + normalize_address(address)
+    result = get_geo_cache().get(key, MISSING)
+    if result is not MISSING:
+        return result
+
+    # wait due to rate limit
+    get_rate_limiter("nominatim").acquire()
+
     try:
         geolocator = Nominatim(user_agent="osint_app")
         geocode = partial(geolocator.geocode, language="en")
 
         location = geolocator.geocode(address)
-
-        result = location.raw["lat"] + ", " + location.raw["lon"]
-
-        return result
     except Exception as e:
         logging.exception("Error in address_to_coordinates!")
+        return None
+
+    # addresses which can not be found are cached as well
+    result = (location.raw["lat"] + ", " + location.raw["lon"]) if location else None
+    get_geo_cache().set(key, result)
+
+    return result
 
 
 def coordinates_to_address(coordinates: str) -> dict:
@@ -31,15 +75,34 @@ def coordinates_to_address(coordinates: str) -> dict:
     # convert coordinates to desired format
     coordinates = ", ".join(coordinates.split(","))
 
+    # check cache
+    try:
+        key = "coordinates:" + normalize_coordinates(coordinates)
+    except ValueError:
+        logging.exception("Error in coordinates_to_address!")
+        return None
+
+    result = get_geo_cache().get(key, MISSING)
+    if result is not MISSING:
+        return result
+
+    # wait due to rate limit
+    get_rate_limiter("nominatim").acquire()
+
     try:
         geolocator = Nominatim(user_agent="osint_app")
         geocode = partial(geolocator.geocode, language="en")
 
         location = geolocator.reverse(coordinates, language="en")
-
-        return location.raw
     except Exception as e:
         logging.exception("Error in coordinates_to_address!")
+        return None
+
+    # coordinates without address are cached as well
+    result = location.raw if location else None
+    get_geo_cache().set(key, result)
+
+    return result
 
 
 def geopy_to_schema(geopy_data: dict) -> dict:
@@ -92,8 +155,6 @@ def complete_location(data: str, given: str = "address") -> dict:
     # get coordinates
     if given == "address":
         coordinates = address_to_coordinates(address=data)
-        # sleep due to rate limit
-        time.sleep(1)
     else:
         coordinates = data
         # convert coordinates to desired format
@@ -101,8 +162,11 @@ def complete_location(data: str, given: str = "address") -> dict:
 
     if coordinates:
         try:
-            # derive detailed address
-            address = coordinates_to_address(coordinates=coordinates)
+            # derive detailed address; offline gazetteer is preferred if configured
+            offline_geocoder = get_offline_geocoder()
+            address = offline_geocoder.reverse(coordinates=coordinates) if offline_geocoder else None
+            if address is None:
+                address = coordinates_to_address(coordinates=coordinates)
             location_schema = geopy_to_schema(geopy_data=address)
 
             # complete location data
@@ -123,3 +187,12 @@ def complete_location(data: str, given: str = "address") -> dict:
             logging.exception("Exception in complete_location! Data: %s" % data)
     else:
         return None
+
+
+def complete_locations(data: List[str], given: str = "address") -> List[dict]:
+    """
+    Completes many locations concurrently (see complete_location).
+    Requests are spread over worker threads within the rate limit of the geocoding provider.
+    """
+
+    return map_concurrently(partial(complete_location, given=given), data)
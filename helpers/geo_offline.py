@@ -0,0 +1,105 @@
+import csv
+import logging
+from functools import lru_cache
+
+import numpy as np
+import pycountry
+from decouple import config
+
+# mean radius of the earth in km
+EARTH_RADIUS = 6371.0
+
+
+class OfflineGeocoder:
+    """
+    Reverse geocoder based on a local GeoNames gazetteer
+    (e.g. cities1000.txt, see http://download.geonames.org/export/dump).
+    Optionally, names of first-order administrative regions are read from admin1CodesASCII.txt.
+    """
+
+    def __init__(self, gazetteer_path: str, admin1_path: str = "", max_distance: float = 50):
+        self.max_distance = max_distance
+
+        # names of administrative regions, e.g. 'DE.16' -> 'Berlin'
+        admin1 = dict()
+        if admin1_path:
+            with open(admin1_path, "r", encoding="utf-8") as f:
+                for row in csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE):
+                    admin1[row[0]] = row[1]
+
+        # places
+        self.places = []
+        points = []
+
+        with open(gazetteer_path, "r", encoding="utf-8") as f:
+            for row in csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE):
+                latitude, longitude = float(row[4]), float(row[5])
+                country_code = row[8]
+
+                self.places.append(
+                    {
+                        "name": row[1],
+                        "lat": row[4],
+                        "lon": row[5],
+                        "country_code": country_code,
+                        "state": admin1.get(country_code + "." + row[10]),
+                    }
+                )
+                points.append((latitude, longitude))
+
+        # nearest neighbour index using great-circle distances; scikit-learn is only imported if configured
+        from sklearn.neighbors import BallTree
+
+        self.index = BallTree(np.radians(points), metric="haversine")
+
+        logging.info("Loaded %d places of offline gazetteer %s" % (len(self.places), gazetteer_path))
+
+    def reverse(self, coordinates: str) -> dict:
+        """
+        Get nearest place of geo coordinates, e.g., '51.1602, 10.4482'.
+        Result is shaped like raw Nominatim data (see coordinates_to_address); None if no place is close enough.
+        """
+
+        latitude, longitude = [float(c) for c in coordinates.split(",")]
+
+        distances, indices = self.index.query(np.radians([[latitude, longitude]]), k=1)
+
+        # great-circle distance in km
+        distance = distances[0][0] * EARTH_RADIUS
+        index = indices[0][0]
+
+        if distance > self.max_distance:
+            return None
+
+        place = self.places[index]
+
+        # address components known to geopy_to_schema
+        address = {"city": place["name"], "country_code": place["country_code"].lower()}
+        if place["state"]:
+            address["state"] = place["state"]
+
+        country = pycountry.countries.get(alpha_2=place["country_code"])
+        country_name = country.name if country else place["country_code"]
+
+        display_name = ", ".join([n for n in [place["name"], place["state"], country_name] if n])
+
+        return {"lat": place["lat"], "lon": place["lon"], "display_name": display_name, "address": address}
+
+
+@lru_cache(maxsize=None)
+def get_offline_geocoder() -> OfflineGeocoder:
+    """
+    Offline reverse geocoder configured by GEO_OFFLINE_GAZETTEER, GEO_OFFLINE_ADMIN1 and
+    GEO_OFFLINE_MAX_DISTANCE (in km); gazetteer is loaded once per process. None if not configured.
+    """
+
+    gazetteer_path = config("GEO_OFFLINE_GAZETTEER", default="")
+
+    if not gazetteer_path:
+        return None
+
+    return OfflineGeocoder(
+        gazetteer_path=gazetteer_path,
+        admin1_path=config("GEO_OFFLINE_ADMIN1", default=""),
+        max_distance=config("GEO_OFFLINE_MAX_DISTANCE", default=50, cast=float),
+    )
@@ -1,4 +1,12 @@
 import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List
+
+from decouple import config
+
+from helpers.cache import PersistentCache
 
 
 def create_hash(s: str) -> str:
@@ -7,7 +15,61 @@ def create_hash(s: str) -> str:
     return hashlib.sha256(s.encode("utf-8")).hexdigest()
 
 
-def get_checksum(file: str) -> str:
-    """ SHA256 checksum/hash value of file (defined in FIPS 180-2) """
+@lru_cache(maxsize=None)
+def get_checksum_cache() -> PersistentCache:
+    """ Persistent cache of checksums keyed by path, size and modification time of file (size: CHECKSUM_CACHE_SIZE). """
+
+    return PersistentCache(
+        path=os.path.join(config("DATA_DIR"), "checksum_cache.sqlite"),
+        max_entries=config("CHECKSUM_CACHE_SIZE", default=1000000, cast=int),
+    )
+
+
+def hash_file(file: str, block_size: int = None) -> str:
+    """ SHA256 hash value of file read in blocks of block_size bytes (default: CHECKSUM_BLOCK_SIZE). """
+
+    if block_size is None:
+        block_size = config("CHECKSUM_BLOCK_SIZE", default=1048576, cast=int)
+
+    sha256 = hashlib.sha256()
+
+    # reuse one buffer for all blocks
+    buffer = bytearray(block_size)
+    view = memoryview(buffer)
+
+    with open(file, "rb", buffering=0) as f:
+        for n in iter(lambda: f.readinto(buffer), 0):
+            sha256.update(view[:n])
+
+    return sha256.hexdigest()
+
+
+def get_checksum(file: str, block_size: int = None) -> str:
+    """
+    SHA256 checksum/hash value of file (defined in FIPS 180-2); the file is streamed in blocks.
+    Unchanged files (same path, size and modification time) are hashed only once.
+    """
+
+    stat = os.stat(file)
+    key = "%s|%d|%d" % (os.path.abspath(file), stat.st_size, stat.st_mtime_ns)
+
+    checksum = get_checksum_cache().get(key=key)
+
+    if checksum is None:
+        checksum = hash_file(file=file, block_size=block_size)
+        get_checksum_cache().set(key=key, value=checksum)
+
+    return checksum
+
+
+def checksum_many(files: List[str], max_workers: int = None) -> List[str]:
+    """
+    Checksums of many files using a pool of threads (CHECKSUM_WORKERS); hashlib releases the GIL while hashing.
+    Results keep the order of files.
+    """
+
+    if max_workers is None:
+        max_workers = config("CHECKSUM_WORKERS", default=4, cast=int)
 
-    return hashlib.sha256(open(file, "rb").read()).hexdigest()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(get_checksum, files))
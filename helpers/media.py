@@ -0,0 +1,168 @@
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Iterable
+from urllib.parse import urlsplit
+
+import requests
+from decouple import config
+from requests.adapters import HTTPAdapter
+
+from helpers.cache import PersistentCache
+from helpers.hash import get_checksum
+
+
+@lru_cache(maxsize=None)
+def get_http_session() -> requests.Session:
+    """ HTTP session shared by all downloads; connections are kept alive and pooled per host. """
+
+    pool_size = config("MEDIA_WORKERS", default=8, cast=int)
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    return session
+
+
+# semaphores limiting concurrent downloads per host
+HOST_SEMAPHORES = dict()
+HOST_SEMAPHORES_LOCK = threading.Lock()
+
+
+def get_host_semaphore(host: str) -> threading.BoundedSemaphore:
+    """ Semaphore limiting concurrent downloads from given host (MEDIA_HOST_CONCURRENCY); shared by all threads. """
+
+    with HOST_SEMAPHORES_LOCK:
+        if host not in HOST_SEMAPHORES:
+            HOST_SEMAPHORES[host] = threading.BoundedSemaphore(config("MEDIA_HOST_CONCURRENCY", default=4, cast=int))
+
+        return HOST_SEMAPHORES[host]
+
+
+@lru_cache(maxsize=None)
+def get_media_index() -> PersistentCache:
+    """ Persistent index of downloaded media: URL -> checksum and path of blob (size: MEDIA_INDEX_SIZE). """
+
+    return PersistentCache(
+        path=os.path.join(config("DATA_DIR"), "media_index.sqlite"),
+        max_entries=config("MEDIA_INDEX_SIZE", default=1000000, cast=int),
+    )
+
+
+def get_blob_path(checksum: str, extension: str = "") -> str:
+    """ Path of blob in content-addressed media store, i.e. DATA_DIR/media/<checksum[:2]>/<checksum><extension>. """
+
+    return os.path.join(config("DATA_DIR"), "media", checksum[:2], checksum + extension)
+
+
+def get_media_checksum(file_path: str) -> str:
+    """ SHA256 checksum of media file; blobs of the media store are named by it, other files are hashed. """
+
+    checksum, extension = os.path.splitext(os.path.basename(file_path))
+
+    # blob of media store
+    if len(checksum) == 64 and file_path == get_blob_path(checksum=checksum, extension=extension):
+        return checksum
+
+    return get_checksum(file=file_path)
+
+
+def fetch_media(url: str) -> str:
+    """
+    Download file from url into the content-addressed media store using the shared HTTP session.
+    Already downloaded URLs are not fetched again; identical files of different URLs are stored once.
+    return: path of blob (None if download failed)
+    """
+
+    # already downloaded
+    entry = get_media_index().get(key=url)
+    if entry is not None and os.path.exists(entry["path"]):
+        return entry["path"]
+
+    temp_path = None
+
+    try:
+        media_dir = os.path.join(config("DATA_DIR"), "media")
+        os.makedirs(media_dir, exist_ok=True)
+
+        # stream into temporary file and hash on the fly
+        sha256 = hashlib.sha256()
+
+        with get_host_semaphore(host=urlsplit(url).netloc):
+            with get_http_session().get(url, stream=True, timeout=config("MEDIA_TIMEOUT", default=30, cast=float)) as r:
+                r.raise_for_status()
+
+                with tempfile.NamedTemporaryFile(dir=media_dir, suffix=".part", delete=False) as f:
+                    temp_path = f.name
+                    for block in r.iter_content(chunk_size=65536):
+                        sha256.update(block)
+                        f.write(block)
+
+        # move into store unless blob is already stored
+        checksum = sha256.hexdigest()
+        file_path = get_blob_path(checksum=checksum, extension=os.path.splitext(urlsplit(url).path)[1].lower())
+
+        if os.path.exists(file_path):
+            os.remove(temp_path)
+        else:
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            os.replace(temp_path, file_path)
+
+        get_media_index().set(key=url, value={"checksum": checksum, "path": file_path})
+
+        return file_path
+    except Exception as e:
+        logging.exception("Exception during fetching of media: %s!" % url)
+
+        if temp_path is not None and os.path.exists(temp_path):
+            os.remove(temp_path)
+
+        return None
+
+
+class MediaDownloader:
+    """
+    Downloads media in background threads (MEDIA_WORKERS), so processing of data does not wait for I/O.
+    Usage: futures = downloader.submit(urls) ... file_paths = downloader.results(futures)
+    """
+
+    def __init__(self, max_workers: int = None):
+        if max_workers is None:
+            max_workers = config("MEDIA_WORKERS", default=8, cast=int)
+
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def submit(self, urls: Iterable[str]) -> Dict[str, Future]:
+        """ Start downloads of distinct URLs (NaN values are skipped); returns futures of file paths by URL. """
+
+        futures = dict()
+
+        for url in urls:
+            # URL should not be NaN
+            if url == url and url not in futures:
+                futures[url] = self.executor.submit(fetch_media, url)
+
+        return futures
+
+    @staticmethod
+    def results(futures: Dict[str, Future]) -> Dict[str, str]:
+        """ Wait for downloads; returns file paths by URL (None if download failed). """
+
+        return {url: future.result() for url, future in futures.items()}
+
+    def shutdown(self):
+        """ Wait for pending downloads and stop worker threads. """
+
+        self.executor.shutdown()
+
+    def __enter__(self) -> "MediaDownloader":
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
@@ -1,11 +1,11 @@
-import logging
 import math
-import os
-import urllib.request
+import re
 from datetime import datetime
+from functools import lru_cache
 
 import emoji
-from decouple import config
+
+from helpers.media import fetch_media
 
 
 def clean_dict(d: dict) -> dict:
@@ -52,17 +52,11 @@ def clean_dict(d: dict) -> dict:
 
 def download_media(url: str) -> str:
     """
-    Download file from url and save to data directory.
+    Download file from url and save to data directory (blocking; see helpers.media.MediaDownloader).
     return: path of downloaded file
     """
 
-    try:
-        file_path = os.path.join(config("DATA_DIR"), "media/" + url.split("/")[-1])
-        urllib.request.urlretrieve(url, file_path)
-        return file_path
-    except Exception as e:
-        logging.exception("Exception during fetching of media: %s!" % url)
-        return None
+    return fetch_media(url=url)
 
 
 def check_in_time_range(dt: str, start_datetime: str, stop_datetime: str) -> bool:
@@ -82,7 +76,15 @@ def check_in_time_range(dt: str, start_datetime: str, stop_datetime: str) -> boo
         return False
 
 
+@lru_cache(maxsize=None)
+def get_emoji_regexp() -> re.Pattern:
+    """ Compiled regular expression matching Emojis. """
+
+    return emoji.get_emoji_regexp()
+
+
+@lru_cache(maxsize=100000)
 def remove_emojis(s: str) -> str:
-    """ Function to remove Emojis from string. """
+    """ Function to remove Emojis from string; results are memoised as names and texts recur often. """
 
-    return emoji.get_emoji_regexp().sub(r"", s)
+    return get_emoji_regexp().sub(r"", s)
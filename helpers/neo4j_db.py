@@ -1,15 +1,24 @@
+import atexit
 import logging
+import threading
+import time
+from typing import Dict, Iterator, List, Tuple
 
 from decouple import config
-from neo4j import TRUST_SYSTEM_CA_SIGNED_CERTIFICATES, GraphDatabase
+from neo4j import TRUST_SYSTEM_CA_SIGNED_CERTIFICATES, Driver, GraphDatabase
 from neo4j.exceptions import ServiceUnavailable
 from tqdm import tqdm
 
 from helpers.schema import get_edge_properties
 
 
-def neo4j_connect():
-    """ Connection to Neo4j """
+# drivers shared by all callers of the process, keyed by (URI, user)
+DRIVERS = dict()
+DRIVERS_LOCK = threading.Lock()
+
+
+def create_driver(uri: str, user: str, password: str) -> Driver:
+    """ Create driver and check connectivity; pool size is configured by NEO4J_POOL_SIZE. """
 
     driver_config = {
         "database": config("NEO4J_DB"),
@@ -17,55 +26,205 @@ def neo4j_connect():
         "trust": TRUST_SYSTEM_CA_SIGNED_CERTIFICATES,
         "user_agent": "osint",
         "max_connection_lifetime": 1000,
-        "max_connection_pool_size": 100,
+        "max_connection_pool_size": config("NEO4J_POOL_SIZE", default=100, cast=int),
         "keep_alive": False,
         "max_transaction_retry_time": 10,
         "resolver": None,
     }
 
+    driver = GraphDatabase.driver(uri, auth=(user, password), **driver_config)
+
     try:
-        driver = GraphDatabase.driver(
-            config("NEO4J_URI"), auth=(config("NEO4J_USER"), config("NEO4J_PW")), **driver_config
-        )
+        driver.verify_connectivity()
+    except ServiceUnavailable as e:
         driver.close()
+        raise RuntimeError("Connection to Neo4j failed!") from e
 
-        return driver
+    return driver
+
+
+def neo4j_connect() -> Driver:
+    """
+    Connection to Neo4j. The driver (and its pool of connections) is created on first use and
+    shared by the whole process; it is closed at exit, hence callers should not close it.
+    """
+
+    key = (config("NEO4J_URI"), config("NEO4J_USER"))
+
+    with DRIVERS_LOCK:
+        if key not in DRIVERS:
+            DRIVERS[key] = create_driver(uri=key[0], user=key[1], password=config("NEO4J_PW"))
+
+        return DRIVERS[key]
 
-    except ServiceUnavailable as e:
-        raise RuntimeError("Connection to Neo4j failed!") from e
 
+def neo4j_health_check() -> bool:
+    """ Checks whether the shared driver can reach the Neo4j server. """
 
-def load_graph_into_db(nodes: dict, edges: dict):
+    try:
+        neo4j_connect().verify_connectivity()
+        return True
+    except (RuntimeError, ServiceUnavailable):
+        logging.exception("Neo4j is not available!")
+        return False
+
+
+@atexit.register
+def close_drivers():
+    """ Close all shared drivers; called at exit of the process. """
+
+    with DRIVERS_LOCK:
+        for driver in DRIVERS.values():
+            driver.close()
+
+        DRIVERS.clear()
+
+
+def chunks(data: list, size: int) -> Iterator[list]:
+    """ Split list into consecutive chunks of given size. """
+
+    for i in range(0, len(data), size):
+        yield data[i : i + size]
+
+
+def merge_nodes(tx, label: str, rows: List[dict]):
+    """ MERGE chunk of nodes with given label in one statement (to be run inside a transaction). """
+
+    query = "UNWIND $rows AS properties MERGE(n:" + label + " {nodeId: properties.nodeId}) ON CREATE SET n=properties"
+    tx.run(query, rows=rows)
+
+
+def aggregate_co_occurrences(edges: List[dict]) -> List[dict]:
+    """
+    Aggregate undirected CO_OCCURRENCE edges locally.
+    Pairs are canonicalised (ordered by nodeId) and duplicates are summed up in 'count',
+    so every distinct pair is written only once.
+    """
+
+    aggregated = dict()
+
+    for edge in edges:
+        # canonical order of undirected pair
+        if str(edge["a"]) <= str(edge["b"]):
+            a, b, label_a, label_b = edge["a"], edge["b"], edge.get("labelA"), edge.get("labelB")
+        else:
+            a, b, label_a, label_b = edge["b"], edge["a"], edge.get("labelB"), edge.get("labelA")
+
+        key = (a, b, label_a, label_b)
+        if key in aggregated:
+            aggregated[key]["count"] += edge.get("count", 1)
+        else:
+            aggregated[key] = {"a": a, "b": b, "labelA": label_a, "labelB": label_b, "count": edge.get("count", 1)}
+
+    return list(aggregated.values())
+
+
+def group_edges(edges: List[dict]) -> Dict[Tuple[str, str], List[dict]]:
+    """
+    Group edges by labels of connected nodes (labelA, labelB); self-loops are filtered.
+    Edges without labels are collected under (None, None). CO_OCCURRENCE edges should carry 'count'.
+    """
+
+    groups = dict()
+
+    for edge in edges:
+        if edge["a"] != edge["b"]:  # filter self-loops
+            key = (edge.get("labelA"), edge.get("labelB"))
+            row = {"a": edge["a"], "b": edge["b"]}
+            if "count" in edge:
+                row["count"] = edge["count"]
+            groups.setdefault(key, []).append(row)
+
+    return groups
+
+
+def merge_edges(tx, label: str, label_a: str, label_b: str, rows: List[dict], properties: dict):
+    """
+    MERGE chunk of relationships between nodes with given labels in one statement (to be run inside a transaction).
+    Node labels allow Neo4j to use the nodeId constraints instead of scanning all nodes.
+    """
+
+    node_a = "(a:" + label_a + " {nodeId: row.a})" if label_a else "(a {nodeId: row.a})"
+    node_b = "(b:" + label_b + " {nodeId: row.b})" if label_b else "(b {nodeId: row.b})"
+
+    query = (
+        "UNWIND $rows AS row MATCH "
+        + node_a
+        + ", "
+        + node_b
+        + " MERGE (a)-[r:"
+        + label
+        + " ]-(b) ON CREATE SET r=$properties"
+    )
+
+    # aggregated co-occurrences carry their count
+    if label == "CO_OCCURRENCE":
+        query += ", r.count = row.count ON MATCH SET r.count = r.count + row.count"
+
+    tx.run(query, rows=rows, properties=properties)
+
+
+def load_graph_into_db(nodes: dict, edges: dict, batch_size: int = None):
     """
     Loading graph into database.
     Values of dictionaries are lists of dictionaries containing the node/edge properties.
-    Edges have to have 'a' and 'b' as keys describing the two connected nodes.
+    Edges have to have 'a' and 'b' as keys describing the two connected nodes and should have 'labelA'
+    and 'labelB' as keys describing their labels (otherwise all nodes have to be scanned).
+    batch_size: number of nodes/edges merged per transaction (default: NEO4J_BATCH_SIZE)
     """
 
+    # init
+    if batch_size is None:
+        batch_size = config("NEO4J_BATCH_SIZE", default=1000, cast=int)
+
     # Neo4j connection
     neo4j = neo4j_connect()
 
     with neo4j.session() as session:
-        # load nodes
+        # load nodes in batches; one explicit transaction per chunk
         for label in nodes.keys():
-            for node in tqdm(nodes[label], desc="Nodes " + label, total=len(nodes[label]), unit="nodes"):
-                query = "MERGE(n:" + label + " {nodeId: $properties.nodeId}) ON CREATE SET n=$properties"
-                session.run(query, properties=node)
+            start = time.perf_counter()
 
-        # load relationships
-        edge_properties = get_edge_properties()
-        for label in edges.keys():
-            for edge in tqdm(edges[label], desc="Edges " + label, total=len(edges[label]), unit="edges"):
-                if edge["a"] != edge["b"]:  # filter self-loops
-                    query = (
-                        "MATCH (a {nodeId: $a}), (b {nodeId: $b}) MERGE (a)-[r:"
-                        + label
-                        + " ]-(b) ON CREATE SET r=$properties"
-                    )
+            # one snapshot per label (a NodeBuffer builds a new list on every access)
+            label_nodes = nodes[label]
 
-                    if label == "CO_OCCURRENCE":
-                        query += " ON MATCH SET r.count = r.count + 1"
+            with tqdm(desc="Nodes " + label, total=len(label_nodes), unit="nodes") as progress:
+                for rows in chunks(label_nodes, batch_size):
+                    session.write_transaction(merge_nodes, label, rows)
+                    progress.update(len(rows))
 
-                    session.run(query, **edge, properties=edge_properties[label])
+            # report throughput
+            duration = time.perf_counter() - start
+            if label_nodes:
+                logging.info(
+                    "Loaded %d %s nodes in %.2fs (%.0f nodes/s)"
+                    % (len(label_nodes), label, duration, len(label_nodes) / max(duration, 1e-9))
+                )
 
-    neo4j.close()
+        # load relationships in batches grouped by (labelA, labelB, relType)
+        edge_properties = get_edge_properties()
+        for label in edges.keys():
+            start = time.perf_counter()
+
+            # write every distinct co-occurring pair only once
+            if label == "CO_OCCURRENCE":
+                label_edges = aggregate_co_occurrences(edges=edges[label])
+                logging.info(
+                    "Aggregated %d CO_OCCURRENCE edges into %d distinct pairs" % (len(edges[label]), len(label_edges))
+                )
+            else:
+                label_edges = edges[label]
+
+            with tqdm(desc="Edges " + label, total=len(label_edges), unit="edges") as progress:
+                for (label_a, label_b), group in group_edges(edges=label_edges).items():
+                    for rows in chunks(group, batch_size):
+                        session.write_transaction(merge_edges, label, label_a, label_b, rows, edge_properties[label])
+                        progress.update(len(rows))
+
+            # report throughput
+            duration = time.perf_counter() - start
+            if label_edges:
+                logging.info(
+                    "Loaded %d %s edges in %.2fs (%.0f edges/s)"
+                    % (len(label_edges), label, duration, len(label_edges) / max(duration, 1e-9))
+                )
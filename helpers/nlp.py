@@ -1,21 +1,30 @@
+import logging
+import os
 import re
-from typing import Dict, List
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List
 
 import spacy
+from decouple import config
 
+from helpers.cache import PersistentCache
 from helpers.date_time import get_standardized_now
 from helpers.extractor import extract_urls
+from helpers.hash import create_hash
 from helpers.misc import clean_dict, remove_emojis
-from helpers.schema import check_schema, create_unique_id
+from helpers.schema import create_unique_ids, validate_many
 
 
-def ner(s: str) -> Dict[str, List[str]]:
-    """ Named entity recognition. """
+@lru_cache(maxsize=None)
+def load_model() -> "spacy.language.Language":
+    """ Load spaCy model once per process; components not needed for NER are disabled. """
+
+    return spacy.load("de_core_news_sm", disable=["tagger", "parser"])
 
-    # load model
-    nlp = spacy.load("de_core_news_sm")
 
-    # cleaning text
+def clean_text(s: str) -> str:
+    """ Clean text before named entity recognition. """
+
     # remove Emojis and leading/ending spaces
     s = remove_emojis(s)
 
@@ -27,25 +36,102 @@ def ner(s: str) -> Dict[str, List[str]]:
     for u in urls:
         s = s.replace(u, " ")
 
-    # processing
-    doc = nlp(s)
+    return s
+
+
+def extract_entity_names(doc: "spacy.tokens.Doc") -> Dict[str, List[str]]:
+    """ Extract names of entities of processed text. """
+
+    return {"Organization": [ent.text for ent in doc.ents if ent.label_ == "ORG" and "!" not in ent.text]}
+
+
+def build_entities(entity_names: Dict[str, List[str]]) -> Dict[str, List[dict]]:
+    """ Create entity nodes from names of extracted entities. """
+
     # store extracted entities
     extracted_entities = {"Organization": []}
 
-    for ent in doc.ents:
-        if ent.label_ == "ORG" and "!" not in ent.text:
-            organization = {
-                "name": ent.text,
-                "timestamp": get_standardized_now(),
-                "schemaVersion": 0.1,
-                "rawData": ent.text,
-            }
-            # add node ID
-            organization_unique_id = create_unique_id(data=organization, schema="Organization")
-            organization["nodeId"] = organization_unique_id
-
-            # check schema
-            if check_schema(data=organization, schema="Organization"):
-                extracted_entities["Organization"].append(organization)
+    organizations = []
+
+    for name in entity_names["Organization"]:
+        organization = {
+            "name": name,
+            "timestamp": get_standardized_now(),
+            "schemaVersion": 0.1,
+            "rawData": name,
+        }
+
+        organizations.append(organization)
+
+    # add node IDs
+    organization_unique_ids = create_unique_ids(rows=organizations, schema="Organization")
+    for organization, organization_unique_id in zip(organizations, organization_unique_ids):
+        organization["nodeId"] = organization_unique_id
+
+    # check schema
+    mask, _ = validate_many(rows=organizations, schema="Organization")
+    extracted_entities["Organization"] = [o for o, valid in zip(organizations, mask) if valid]
 
     return clean_dict(extracted_entities)
+
+
+@lru_cache(maxsize=None)
+def get_ner_cache() -> PersistentCache:
+    """ Persistent cache of extracted entity names keyed by hash of cleaned text (size: NER_CACHE_SIZE). """
+
+    return PersistentCache(
+        path=os.path.join(config("DATA_DIR"), "ner_cache_de_core_news_sm.sqlite"),
+        max_entries=config("NER_CACHE_SIZE", default=1000000, cast=int),
+    )
+
+
+def ner(s: str) -> Dict[str, List[dict]]:
+    """ Named entity recognition. """
+
+    return next(ner_many(texts=[s], batch_size=1, n_process=1))
+
+
+def ner_many(texts: Iterable[str], batch_size: int = None, n_process: int = None) -> Iterator[Dict[str, List[dict]]]:
+    """
+    Named entity recognition for many texts; texts are streamed through the model in batches.
+    Yields extracted entities (see ner) in order of texts.
+    Results are cached by hash of cleaned text, hence texts with the same content are processed only once.
+    batch_size/n_process: default NER_BATCH_SIZE/NER_PROCESSES
+    """
+
+    # init
+    if batch_size is None:
+        batch_size = config("NER_BATCH_SIZE", default=256, cast=int)
+    if n_process is None:
+        n_process = config("NER_PROCESSES", default=1, cast=int)
+
+    cache = get_ner_cache()
+
+    # cleaning texts
+    cleaned_texts = [clean_text(s) for s in texts]
+    keys = [create_hash(s=s) for s in cleaned_texts]
+
+    # look up cached entity names; texts with same content are processed once
+    entity_names = dict()
+    to_process = []
+
+    for i, key in enumerate(keys):
+        if key not in entity_names:
+            entity_names[key] = cache.get(key)
+            if entity_names[key] is None:
+                to_process.append(i)
+
+    logging.info(
+        "NER cache: %d texts, %d distinct texts, %d processed, cache %s"
+        % (len(keys), len(entity_names), len(to_process), cache.stats())
+    )
+
+    # processing; documents are in order of first occurrence of uncached texts
+    docs = load_model().pipe((cleaned_texts[i] for i in to_process), batch_size=batch_size, n_process=n_process)
+
+    for key in keys:
+        if entity_names[key] is None:
+            entity_names[key] = extract_entity_names(doc=next(docs))
+            cache.set(key, entity_names[key])
+
+        yield build_entities(entity_names=entity_names[key])
@@ -71,13 +71,15 @@ def enrich_node(node: dict) -> List[Dict]:
                 for n in v:
                     # store node ID
                     node_id = n["nodeId"]
-                    node_ids.append(node_id)
+                    node_ids.append((node_id, k))
                     # add CO_OCCURRENCE relationship to original node
-                    edges_enrichment["CO_OCCURRENCE"].append({"a": node["nodeId"], "b": node_id})
+                    edges_enrichment["CO_OCCURRENCE"].append(
+                        {"a": node["nodeId"], "b": node_id, "labelA": entity_type, "labelB": k}
+                    )
 
                     # add CO_OCCURRENCE relationship to other derived entities
-                    for i in node_ids[:n_i]:
-                        edges_enrichment["CO_OCCURRENCE"].append({"a": i, "b": node_id})
+                    for i, i_label in node_ids[:n_i]:
+                        edges_enrichment["CO_OCCURRENCE"].append({"a": i, "b": node_id, "labelA": i_label, "labelB": k})
 
                     n_i += 1
 
@@ -0,0 +1,70 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Iterable, List
+
+from decouple import config
+
+# default rate limits (requests per second) of providers
+DEFAULT_RATES = {"nominatim": 1.0, "vk": 3.0, "twitter": 1.0, "instagram": 0.5}
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter shared by threads.
+    Tokens are refilled with given rate (per second) up to capacity (maximum burst of requests).
+    """
+
+    def __init__(self, rate: float, capacity: float = 1):
+        self.rate = rate
+        self.capacity = capacity
+
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """ Take one token; blocks until a token is available. """
+
+        while True:
+            with self.lock:
+                # refill
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                wait = (1 - self.tokens) / self.rate
+
+            time.sleep(wait)
+
+
+@lru_cache(maxsize=None)
+def get_rate_limiter(provider: str) -> TokenBucket:
+    """
+    Rate limiter shared by all requests to given provider, e.g. 'nominatim'.
+    Configured by RATE_LIMIT_<PROVIDER> (requests per second) and RATE_BURST_<PROVIDER> (maximum burst).
+    """
+
+    rate = config("RATE_LIMIT_" + provider.upper(), default=DEFAULT_RATES.get(provider, 1.0), cast=float)
+    capacity = config("RATE_BURST_" + provider.upper(), default=1, cast=float)
+
+    return TokenBucket(rate=rate, capacity=capacity)
+
+
+def map_concurrently(function: Callable, items: Iterable, max_workers: int = None) -> List:
+    """
+    Apply (rate limited) function to all items using a pool of worker threads, so waiting for
+    responses overlaps and the allowed request rates are saturated. Results keep the order of items.
+    Number of workers is configured by RATE_LIMIT_WORKERS.
+    """
+
+    if max_workers is None:
+        max_workers = config("RATE_LIMIT_WORKERS", default=8, cast=int)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(function, items))
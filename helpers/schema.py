@@ -1,8 +1,11 @@
 import json
 import logging
+import os
+from functools import lru_cache
 from os.path import dirname, join
-from typing import Dict, List
+from typing import Callable, Dict, Iterable, List, Tuple
 
+import pandas as pd
 from decouple import config
 from jsonschema import Draft7Validator, RefResolver
 from jsonschema.exceptions import ValidationError
@@ -10,25 +13,120 @@ from jsonschema.exceptions import ValidationError
 from helpers.date_time import get_standardized_now
 from helpers.hash import create_hash
 
+# optional compiled validator backend
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
 
-def get_primary_keys(schema: str) -> List[str]:
-    """ Return primary key for given schema. """
+
+@lru_cache(maxsize=None)
+def load_primary_keys() -> Dict[str, Tuple[str, ...]]:
+    """ Load primary keys of all schemas; file is read only once per process. """
 
     # read file
     with open(config("PRIMARY_KEYS_FILE"), "r") as primary_keys_file:
         primary_keys = json.load(primary_keys_file)
 
-    return primary_keys[schema]
+    return {k: tuple(v) for k, v in primary_keys.items()}
+
+
+def get_primary_keys(schema: str) -> Tuple[str, ...]:
+    """ Return primary key for given schema. """
+
+    return load_primary_keys()[schema]
+
+
+@lru_cache(maxsize=None)
+def load_schemas() -> Dict[str, dict]:
+    """
+    Load and check all schemas of schema directory.
+    Schemas are read only once per process; returned dictionaries should not be modified.
+    """
+
+    schemas = dict()
+
+    for file_name in sorted(os.listdir(config("SCHEMA_DIR_PATH"))):
+        if not file_name.endswith(".json"):
+            continue
+
+        with open(join(config("SCHEMA_DIR_PATH"), file_name), "r") as schema_file:
+            data_schema = json.load(schema_file)
+
+        # check if schema is valid
+        Draft7Validator.check_schema(data_schema)
+
+        schemas[file_name[: -len(".json")]] = data_schema
+
+    return schemas
 
 
 def get_schema(schema: str) -> dict:
     """ Get specified schema. """
 
-    schema_path = join(config("SCHEMA_DIR_PATH"), schema + ".json")
-    with open(schema_path, "r") as schema_file:
-        data_schema = json.load(schema_file)
+    return load_schemas()[schema]
+
+
+def get_schema_formats(data_schema) -> List[str]:
+    """ Return all formats used in given schema. """
+
+    formats = []
+
+    if isinstance(data_schema, dict):
+        if isinstance(data_schema.get("format"), str):
+            formats.append(data_schema["format"])
+        for v in data_schema.values():
+            formats.extend(get_schema_formats(v))
+    elif isinstance(data_schema, list):
+        for v in data_schema:
+            formats.extend(get_schema_formats(v))
+
+    return formats
+
+
+def compile_validator(schema: str) -> Callable[[dict], None]:
+    """ Compile validator using fastjsonschema; behaves like the Draft7Validator (formats are not checked). """
+
+    base_schema = get_schema(schema="Base")
+    data_schema = get_schema(schema=schema)
+
+    # formats are not checked by Draft7Validator without format checker
+    formats = {f: (lambda v: True) for f in get_schema_formats(base_schema) + get_schema_formats(data_schema)}
+
+    # references without scheme, e.g. 'Base#/definitions/nodeId', point to base schema
+    validate = fastjsonschema.compile(data_schema, handlers={"": lambda uri: base_schema}, formats=formats)
+
+    def validator(data: dict):
+        try:
+            validate(data)
+        except fastjsonschema.JsonSchemaException as e:
+            raise ValidationError(str(e)) from e
+
+    return validator
+
+
+@lru_cache(maxsize=None)
+def get_validator(schema: str) -> Callable[[dict], None]:
+    """
+    Return ready-made validator for given schema raising ValidationError for invalid data.
+    Backend is configured by SCHEMA_VALIDATOR ('jsonschema' or compiled 'fastjsonschema').
+    """
 
-    return data_schema
+    backend = config("SCHEMA_VALIDATOR", default="jsonschema")
+
+    if backend == "fastjsonschema":
+        if fastjsonschema is None:
+            logging.warning("fastjsonschema is not installed; falling back to jsonschema!")
+        else:
+            try:
+                return compile_validator(schema=schema)
+            except Exception:
+                logging.exception("Compilation of schema %s failed; falling back to jsonschema!" % schema)
+
+    # resolve references
+    resolver = RefResolver.from_schema(get_schema(schema="Base"))
+
+    return Draft7Validator(get_schema(schema=schema), resolver=resolver).validate
 
 
 def get_properties(schema: str, required: bool = False) -> List[str]:
@@ -47,44 +145,95 @@ def get_properties(schema: str, required: bool = False) -> List[str]:
 def check_schema(data: dict, schema: str) -> bool:
     """ Checks whether the given data matches the schema. """
 
-    # get schemas
-    base_schema = get_schema(schema="Base")
-    data_schema = get_schema(schema=schema)
-
-    # resolve references
-    resolver = RefResolver.from_schema(base_schema)
-
-    # check if schema is valid
-    Draft7Validator.check_schema(data_schema)
-
     # validate data
-    validator = Draft7Validator(data_schema, resolver=resolver)
+    validator = get_validator(schema=schema)
 
     try:
-        validator.validate(data)
+        validator(data)
         return True
     except ValidationError:
         logging.exception("Exception occurred in check_schema: Invalid schema!")
         return False
 
 
+def validate_many(rows: List[dict], schema: str) -> Tuple[List[bool], Dict[str, int]]:
+    """
+    Checks whether the given data matches the schema for a batch of rows.
+    return: mask of valid rows and number of occurrences of every error message
+    Failures are summarized in one log record per batch.
+    """
+
+    # validate data
+    validator = get_validator(schema=schema)
+
+    mask = []
+    errors = dict()
+
+    for data in rows:
+        try:
+            validator(data)
+            mask.append(True)
+        except ValidationError as e:
+            mask.append(False)
+            errors[e.message] = errors.get(e.message, 0) + 1
+
+    if errors:
+        logging.warning(
+            "Invalid schema in validate_many: %d of %d rows do not match %s! Errors: %s"
+            % (mask.count(False), len(mask), schema, errors)
+        )
+
+    return mask, errors
+
+
 def create_unique_id(data: dict, schema: str) -> str:
     """ Create unique id for given subject. """
 
+    return create_unique_ids(rows=[data], schema=schema)[0]
+
+
+def create_unique_ids(rows: Iterable[dict], schema: str) -> List[str]:
+    """ Create unique ids for many subjects of the same schema (None if primary key values are missing). """
+
     # get primary keys
     pks = get_primary_keys(schema=schema)
 
-    # create unique id if primary key values are available
-    try:
-        pks_values = list({k: str(data[k]).lower() for k in pks}.values())
+    unique_ids = []
+
+    for data in rows:
+        # create unique id if primary key values are available
+        try:
+            pks_values = [str(data[k]).lower() for k in pks]
+        except KeyError:
+            unique_ids.append(None)
+            continue
+
+        unique_ids.append(create_hash(s=schema + "-".join(pks_values)))
+
+    return unique_ids
+
+
+def create_unique_ids_frame(data: pd.DataFrame, schema: str) -> pd.Series:
+    """
+    Create unique ids column-wise for a table of subjects of the same schema (columns are properties).
+    Every distinct key is hashed only once; None if primary key values are missing (or null).
+    """
+
+    # get primary keys
+    pks = list(get_primary_keys(schema=schema))
+
+    if not all(k in data.columns for k in pks):
+        return pd.Series(None, index=data.index, dtype=object)
 
-        unique_id = schema + "-".join(pks_values)
-        unique_id = create_hash(s=unique_id)
+    # keys as in create_unique_id
+    keys = pd.Series(schema, index=data.index)
+    for i, k in enumerate(pks):
+        keys = keys + ("-" if i else "") + data[k].astype(str).str.lower()
 
-        return unique_id
+    unique_ids = keys.map({key: create_hash(s=key) for key in keys.unique()}).astype(object)
+    unique_ids[data[pks].isna().any(axis=1)] = None
 
-    except KeyError:
-        return None
+    return unique_ids
 
 
 def get_edge_properties() -> dict:
@@ -9,8 +9,10 @@ from tqdm import tqdm
 
 from analytics.network_metrics import betweenness_centrality
 from analytics.plotting import base_plotter, draw_world_map, table_plotter
-from helpers.neo4j_db import load_graph_into_db, neo4j_connect
-from helpers.nlp import ner
+from helpers.buffer import NodeBuffer
+from helpers.date_time import get_standardized_now
+from helpers.neo4j_db import chunks, load_graph_into_db, neo4j_connect
+from helpers.nlp import ner_many
 from helpers.schema import get_graph_model
 
 
@@ -24,6 +26,9 @@ def parser():
         "--world_map", help="Draw world map showing location contained in intelligence graph.", action="store_true"
     )
     parser.add_argument("--named_entity_recognition", help="Extract entities from text nodes.", action="store_true")
+    parser.add_argument(
+        "--incremental", help="Extract entities only from text nodes not processed before.", action="store_true"
+    )
     parser.add_argument("--calculate_centrality", help="Calculate betweenness centrality.", action="store_true")
 
     args = parser.parse_args()
@@ -33,6 +38,7 @@ def parser():
         args.most_used_keywords,
         args.world_map,
         args.named_entity_recognition,
+        args.incremental,
         args.calculate_centrality,
     )
 
@@ -43,6 +49,7 @@ def parser():
     most_used_keywords,
     world_map,
     named_entity_recognition,
+    incremental,
     calculate_centrality,
 ) = parser()
 
@@ -172,19 +179,26 @@ if __name__ == "__main__":
 
     if named_entity_recognition:
         # init
-        nodes_ner = {"Organization": []}
+        nodes_ner = NodeBuffer(labels=["Organization"])
         edges_ner = {"INCLUSION": [], "CO_OCCURRENCE": []}
         # get text nodes
         with neo4j.session() as session:
 
-            query = "MATCH (n:Text) RETURN n.text as text, n.nodeId as nodeId"
+            # texts already processed are marked by nerTimestamp
+            if incremental:
+                query = "MATCH (n:Text) WHERE n.nerTimestamp IS NULL RETURN n.text as text, n.nodeId as nodeId"
+            else:
+                query = "MATCH (n:Text) RETURN n.text as text, n.nodeId as nodeId"
             result = session.run(query)
 
             texts = [(r["text"], r["nodeId"]) for r in result]
 
         # extract entities
-        for t, t_node_id in texts:
-            extracted_entities = ner(t)
+        extracted_entities_texts = ner_many(texts=[t for t, _ in texts])
+
+        for (t, t_node_id), extracted_entities in tqdm(
+            zip(texts, extracted_entities_texts), desc="Texts", total=len(texts), unit="texts"
+        ):
 
             # store data
             if extracted_entities:
@@ -194,26 +208,39 @@ if __name__ == "__main__":
 
                 # iterate over different entity types extracted from text
                 for k, v in extracted_entities.items():
-                    # add entity
-                    nodes_ner[k].extend(v)
+                    # add entities
+                    for n in v:
+                        nodes_ner.append(k, n)
 
                     # iterate over different entities
                     for n in v:
                         # node ID
                         node_id = n["nodeId"]
-                        node_ids.append(node_id)
+                        node_ids.append((node_id, k))
                         # add INCLUSION relationship to original text node
-                        edges_ner["INCLUSION"].append({"a": t_node_id, "b": node_id})
+                        edges_ner["INCLUSION"].append({"a": t_node_id, "b": node_id, "labelA": "Text", "labelB": k})
 
                         # add CO_OCCURRENCE relationship to other derived entities
-                        for i in node_ids[:n_i]:
-                            edges_ner["CO_OCCURRENCE"].append({"a": i, "b": node_id})
+                        for i, i_label in node_ids[:n_i]:
+                            edges_ner["CO_OCCURRENCE"].append({"a": i, "b": node_id, "labelA": i_label, "labelB": k})
 
                         n_i += 1
 
+        # duplicates are dropped before loading
+        nodes_ner.log_duplicates()
+
         # store in intelligence graph
         load_graph_into_db(nodes=nodes_ner, edges=edges_ner)
 
+        # mark processed texts
+        with neo4j.session() as session:
+            query = "UNWIND $nodeIds AS nodeId MATCH (n:Text {nodeId: nodeId}) SET n.nerTimestamp = $timestamp"
+            timestamp = get_standardized_now()
+            batch_size = config("NEO4J_BATCH_SIZE", default=1000, cast=int)
+
+            for node_ids in chunks([t_node_id for _, t_node_id in texts], batch_size):
+                session.run(query, nodeIds=node_ids, timestamp=timestamp)
+
     ###############################################################################################
     # Betweenness centrality
 
@@ -259,6 +286,3 @@ if __name__ == "__main__":
             param_plot={"figsize": (10, 7)},
             param_ax={"facecolor": "cornflowerblue"},
         )
-
-    # close connection to Neo4j
-    neo4j.close()
@@ -64,8 +64,6 @@ if __name__ == "__main__":
             result = session.run("MATCH (n:Username) RETURN distinct n.username AS username")
             usernames = [r["username"] for r in result]
 
-        neo4j.close()
-
         # get Twitter account information
         twitter_data_path_users = twitter_lookup(usernames=usernames)
 
@@ -62,9 +62,6 @@ if __name__ == "__main__":
     if entity_type:
         nodes2enrich = [n for n in nodes2enrich if n["label"] == entity_type]
 
-    # close connection
-    neo4j.close()
-
     print("Got leaf nodes!")
 
     ###############################################################################################
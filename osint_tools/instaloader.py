@@ -1,5 +1,7 @@
 import instaloader
 
+from helpers.rate_limit import get_rate_limiter
+
 
 def get_instagram_id(username: str) -> str:
     """ Returns belonging Instagram ID given some username. """
@@ -8,6 +10,8 @@ def get_instagram_id(username: str) -> str:
     L = instaloader.Instaloader()
 
     # get Instagram profile
+    get_rate_limiter("instagram").acquire()
+
     try:
         profile = instaloader.Profile.from_username(L.context, username)
         return str(profile.userid)
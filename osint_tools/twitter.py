@@ -2,6 +2,8 @@ import tweepy
 
 from decouple import config
 
+from helpers.rate_limit import get_rate_limiter
+
 
 def get_twitter_user(username: str) -> "tweepy.models.User":
     """ Returns Twitter user profile given the username. """
@@ -22,6 +24,8 @@ def get_twitter_user(username: str) -> "tweepy.models.User":
     api = tweepy.API(auth)
 
     # get user profile
+    get_rate_limiter("twitter").acquire()
+
     try:
         user = api.get_user(username)
         return user
@@ -1,4 +1,5 @@
 from decouple import config, Csv
+from helpers.rate_limit import get_rate_limiter
 from helpers.vk import get_vk_session
 
 
@@ -9,6 +10,8 @@ def get_vk_id(username: str) -> str:
     vkapi = [get_vk_session(token=config("VK_TOKENS", cast=Csv())[i]) for i in range(6)][5]
 
     # getting ID
+    get_rate_limiter("vk").acquire()
+
     try:
         username_id = vkapi.users.get(user_ids=[username], v=config("VK_API_VERSION"))[0]["id"]
         return str(username_id)